@@ -0,0 +1 @@
+__all__=["grammars", "sentences", "suite"]
\ No newline at end of file
@@ -0,0 +1,35 @@
+import sys
+import json
+import argparse
+
+from benchmarks.suite import SCALES, run, compare
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks of llgram table generation and parsing.")
+    parser.add_argument("--scale", action="append", choices=list(SCALES), help="scale to run, can be repeated (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of every step, the best one is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the grammar and sentence generators")
+    parser.add_argument("--output", help="write the results as JSON to this file (default: standard output)")
+    parser.add_argument("--baseline", help="compare the results against results stored in this file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default: 0.2)")
+    arguments = parser.parse_args(argv)
+
+    results = run(arguments.scale, repeat=arguments.repeat, seed=arguments.seed)
+
+    if arguments.output:
+        with open(arguments.output, "w") as fout:
+            json.dump(results, fout, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r") as fin:
+            regressions = compare(results, json.load(fin), arguments.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import random
+
+from llgram import constants as const
+
+SEPARATOR = "sep" #terminal following every occurrence of a nullable nonterminal, never starts a rule
+
+def randomGrammar(rules: int, nonterminals: int, terminals: int, nullable: float=0.1, rightLength: tuple=(1, 4),
+        nonterminalRatio: float=0.4, seed=None) -> str:
+    """
+        Generates a random LL(1) grammar of the given size in the llgram grammar language.
+
+        The grammar is LL(1) by construction: every rule starts with a terminal (its leader) that differs from the leaders
+        of the other rules of its nonterminal, so the first sets of the alternatives are disjoint. Nullable nonterminals
+        get an additional epsilon rule and every occurrence of them is followed by SEPARATOR, which is never a leader,
+        so their follow sets can't collide with their first sets. The first rule of every nonterminal contains only
+        terminals, so every nonterminal derives a finite sentence. The start symbol is N0 (the left hand side of the first rule), it is never nullable.
+        To keep every nonterminal reachable from the start symbol, a reference to it is inserted into a rule of an earlier nonterminal,
+        which makes some rules longer than rightLength.
+
+        Parameters
+        ----------
+        rules: int
+            Number of rules, not counting the epsilon rules of nullable nonterminals.
+            At least one and at most terminals rules per nonterminal.
+
+        nonterminals: int
+            Number of nonterminals (N0, N1, ...)
+
+        terminals: int
+            Number of leader terminals (t0, t1, ...), SEPARATOR is added to them
+
+        nullable: float
+            Fraction of the nonterminals (except the start symbol) which can derive an empty string
+
+        rightLength: tuple
+            (minimum, maximum) length of the right hand sides, the leader included
+
+        nonterminalRatio: float
+            Probability of a symbol after the leader being a nonterminal
+
+        seed: int
+            Seed of the random generator, the same arguments and seed always give the same grammar
+
+        Returns
+        -------
+        str
+            Grammar text accepted by llgram.generation.TableGenerator
+    """
+    if nonterminals < 1 or terminals < 1:
+        raise ValueError("A grammar needs at least one nonterminal and one terminal")
+    if not nonterminals <= rules <= nonterminals * terminals:
+        raise ValueError(f"The number of rules has to be between {nonterminals} and {nonterminals * terminals}")
+    if rightLength[0] < 1 or rightLength[1] < rightLength[0]:
+        raise ValueError("Right hand sides have to contain at least the leader")
+
+    rng = random.Random(seed)
+    names = [f"N{i}" for i in range(nonterminals)]
+    leaders = [f"t{i}" for i in range(terminals)]
+    alphabet = leaders + [SEPARATOR]
+    nullables = {name for name in names[1:] if rng.random() < nullable}
+
+    #every nonterminal has at least one rule and the start symbol two if possible, the rest is spread randomly
+    counts = [1] * nonterminals
+    spare = [i for i in range(nonterminals) for _ in range(terminals - 1)]
+    if terminals > 1 and rules > nonterminals:
+        counts[0] += 1
+        spare.remove(0)
+    for i in rng.sample(spare, rules - sum(counts)):
+        counts[i] += 1
+
+    def symbols(length, terminalsOnly):
+        result = []
+        for _ in range(length):
+            if not terminalsOnly and rng.random() < nonterminalRatio:
+                result.extend(reference(rng.choice(names)))
+            else:
+                result.append(rng.choice(alphabet))
+        return result
+
+    def reference(name):
+        return [name, SEPARATOR] if name in nullables else [name]
+
+    rights = []
+    for name, count in zip(names, counts):
+        rights.append([[leader] + symbols(rng.randint(*rightLength) - 1, j == 0) for j, leader in enumerate(rng.sample(leaders, count))])
+
+    #every nonterminal is referenced by a rule (not the first one) of an earlier nonterminal, so all are reachable from the start symbol
+    parents = []
+    for i in range(1, nonterminals):
+        if counts[i - 1] > 1:
+            parents.append(i - 1)
+        if parents:
+            right = rng.choice(rights[rng.choice(parents)][1:])
+            #not between a nullable nonterminal and its separator
+            position = rng.choice([k for k in range(1, len(right) + 1) if right[k - 1] not in nullables])
+            right[position:position] = reference(names[i])
+
+    lines = []
+    for name, ruleRights in zip(names, rights):
+        for right in ruleRights:
+            lines.append(f"{name} -> {' '.join(right)}")
+        if name in nullables:
+            lines.append(f"{name} -> {const.EPSILON_SYMBOL}")
+    return "\n".join(lines)
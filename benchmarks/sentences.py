@@ -0,0 +1,179 @@
+import random
+
+from llgram.compiled import CompiledTable, NO_RULE
+
+INFINITE = float("inf")
+
+def minimalLengths(compiled: CompiledTable) -> tuple:
+    """
+        Computes the length of the shortest sentence every symbol derives, using the rules of the table.
+
+        Parameters
+        ----------
+        compiled: CompiledTable
+            The table
+
+        Returns
+        -------
+        list
+            Shortest sentence length indexed by symbol ID (INFINITE for nonterminals deriving no sentence)
+        list
+            Rule ID of a rule giving the shortest sentence indexed by symbol ID (NO_RULE for terminals)
+    """
+    lengths = [1] * compiled.terminalCount + [INFINITE] * len(compiled.nonterminals)
+    best = [NO_RULE] * len(compiled.symbols)
+    ruleLeft = compiled.ruleLeft
+
+    changed = True
+    while changed:
+        changed = False
+        for rule, right in enumerate(compiled.ruleRight):
+            length = sum(lengths[symbol] for symbol in right)
+            left = ruleLeft[rule]
+            if length < lengths[left]:
+                lengths[left] = length
+                best[left] = rule
+                changed = True
+    return lengths, best
+
+def unboundedSymbols(compiled: CompiledTable, lengths: list) -> set:
+    """
+        Finds the nonterminals which derive arbitrarily long sentences, i.e. can reach a cycle through rules
+        whose symbols all derive a sentence.
+
+        Parameters
+        ----------
+        compiled: CompiledTable
+            The table
+
+        lengths: list
+            Shortest sentence lengths returned by minimalLengths
+
+        Returns
+        -------
+        set
+            IDs of the unbounded nonterminals
+    """
+    terminalCount = compiled.terminalCount
+    successors = {symbolId:set() for symbolId in range(terminalCount, len(compiled.symbols))}
+    for rule, right in enumerate(compiled.ruleRight):
+        if all(lengths[symbol] != INFINITE for symbol in right):
+            successors[compiled.ruleLeft[rule]].update(symbol for symbol in right if symbol >= terminalCount)
+
+    #nonterminals only reaching removed nonterminals are removed, the ones left can reach a cycle
+    predecessors = {symbolId:[] for symbolId in successors}
+    for symbolId, targets in successors.items():
+        for target in targets:
+            predecessors[target].append(symbolId)
+    degree = {symbolId:len(targets) for symbolId, targets in successors.items()}
+    worklist = [symbolId for symbolId, count in degree.items() if count == 0]
+    bounded = set(worklist)
+    while worklist:
+        for predecessor in predecessors[worklist.pop()]:
+            degree[predecessor] -= 1
+            if degree[predecessor] == 0:
+                bounded.add(predecessor)
+                worklist.append(predecessor)
+    return set(successors) - bounded
+
+class SentenceGenerator:
+    def __init__(self, table):
+        """
+            Generates random sentences of a grammar by random leftmost derivations over its parsing table.
+
+            Every nonterminal is rewritten by a random rule from its table row until the sentence (together with the shortest
+            completion of the symbols still on the stack) reaches the requested length, then by the rules giving
+            the shortest sentences, so every derivation ends. While the sentence is too short, the last nonterminal on the stack
+            deriving arbitrarily long sentences is rewritten by a rule which keeps one, so the derivation doesn't end early.
+
+            Parameters
+            ----------
+            table: CompiledTable or TableGenerator
+                Table of the grammar
+        """
+        self.compiled = CompiledTable.fromGenerator(table)
+        self.lengths, self.best = minimalLengths(self.compiled)
+
+        compiled = self.compiled
+        self.choices = [()] * compiled.terminalCount #distinct rules of every table row, indexed by symbol ID
+        for symbolId in range(compiled.terminalCount, len(compiled.symbols)):
+            self.choices.append(tuple(sorted(set(compiled.row(symbolId).values()))))
+
+        self.unbounded = unboundedSymbols(self.compiled, self.lengths)
+        #rules of every row containing a nonterminal which derives arbitrarily long sentences
+        self.growing = [tuple(rule for rule in rules if self.__grows(rule)) for rules in self.choices]
+
+    def __grows(self, rule):
+        right = self.compiled.ruleRight[rule]
+        return any(symbol in self.unbounded for symbol in right) and all(self.lengths[symbol] != INFINITE for symbol in right)
+
+    def sentence(self, length: int, seed=None) -> list:
+        """
+            Returns a random sentence of the grammar with about length terminals. The sentence is longer if the grammar
+            has no sentence that short, and can be slightly longer when the last random rule brings more symbols than needed.
+
+            Parameters
+            ----------
+            length: int
+                Requested number of terminals
+
+            seed: int
+                Seed of the random generator
+
+            Returns
+            -------
+            list
+                The sentence as a list of terminals
+        """
+        rng = random.Random(seed)
+        compiled = self.compiled
+        symbols = compiled.symbols
+        right = compiled.ruleRight
+        terminalCount = compiled.terminalCount
+        lengths = self.lengths
+        best = self.best
+        choices = self.choices
+        growing = self.growing
+        unbounded = self.unbounded
+
+        if lengths[compiled.startId] == INFINITE:
+            raise ValueError("The start symbol derives no sentence")
+
+        result = []
+        emit = result.append
+        stack = [compiled.startId]
+        pending = lengths[compiled.startId] #length of the shortest completion of the stack
+        open = 1 if compiled.startId in unbounded else 0 #unbounded nonterminals on the stack
+        while stack:
+            top = stack.pop()
+            if top < terminalCount:
+                emit(symbols[top])
+                pending -= 1
+                continue
+            pending -= lengths[top]
+            if top in unbounded:
+                open -= 1
+            rule = NO_RULE
+            if len(result) + pending < length:
+                if open == 0 and growing[top]:
+                    rule = rng.choice(growing[top])
+                elif choices[top]:
+                    rule = rng.choice(choices[top])
+                    if any(lengths[symbol] == INFINITE for symbol in right[rule]):
+                        rule = NO_RULE
+            if rule == NO_RULE:
+                rule = best[top]
+            for symbol in right[rule]:
+                pending += lengths[symbol]
+                if symbol in unbounded:
+                    open += 1
+            stack.extend(right[rule])
+        return result
+
+    def sentences(self, count: int, length: int, seed=None):
+        """
+            Yields count random sentences, see sentence.
+        """
+        rng = random.Random(seed)
+        for _ in range(count):
+            yield self.sentence(length, rng.random())
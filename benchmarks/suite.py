@@ -0,0 +1,179 @@
+import time
+import platform
+import tracemalloc
+
+import llgram
+from llgram.generation import TableGenerator
+from llgram.compiled import CompiledTable
+from llgram.parsing import LLParser
+from llgram.stats import Stats
+
+from benchmarks.grammars import randomGrammar
+from benchmarks.sentences import SentenceGenerator
+
+#grammar size and sentence length of every scale
+SCALES = {
+    "small": {"rules":200, "nonterminals":50, "terminals":20, "length":10000},
+    "medium": {"rules":5000, "nonterminals":1000, "terminals":50, "length":100000},
+    "large": {"rules":50000, "nonterminals":10000, "terminals":100, "length":1000000},
+}
+
+#phases of TableGenerator recorded with llgram.stats.Stats
+PHASES = ("lexing", "emptySets", "firstSets", "ruleFirstSets", "followSets", "table")
+
+#metrics compared against a baseline, True if higher is better
+METRICS = {
+    "lexing":False,
+    "emptySets":False,
+    "firstSets":False,
+    "ruleFirstSets":False,
+    "followSets":False,
+    "table":False,
+    "generate":False,
+    "compile":False,
+    "compress":False,
+    "compressionRatio":True,
+    "parse":False,
+    "parseCompressed":False,
+    "accepts":False,
+    "tokensPerSecond":True,
+    "generatePeakBytes":False,
+    "parsePeakBytes":False,
+}
+
+def run(scales=None, repeat: int=3, seed: int=0, nullable: float=0.1, rightLength: tuple=(1, 4)) -> dict:
+    """
+        Runs the benchmarks on random grammars (see benchmarks.grammars.randomGrammar) and sentences of every scale.
+
+        Times are the best of repeat runs in seconds. The phases of TableGenerator (PHASES) are recorded with llgram.stats.Stats
+        in the runs timing generate, the whole TableGenerator construction, so the best time of every phase may come from a different run.
+        compress and parseCompressed time the compressed table (see llgram.compiled.CompiledTable.compress),
+        compressionRatio is the size of the dense table divided by the size of the compressed one.
+        accepts times the recognizer (see llgram.parsing.LLParser.accepts) on the same sentence as parse.
+        Counters of the generator and the parser (fixpoint iterations, table lookups, stack depth) are reported under "counters",
+        from an extra instrumented parse. Peak memory is measured with tracemalloc in an extra run, so it doesn't slow down the timed ones.
+
+        Parameters
+        ----------
+        scales: iterable
+            Names of the scales to run (keys of SCALES), defaults to all
+
+        repeat: int
+            Number of timed runs of every step
+
+        seed: int
+            Seed of the grammar and sentence generators
+
+        nullable: float
+            Fraction of nullable nonterminals
+
+        rightLength: tuple
+            (minimum, maximum) length of the right hand sides
+
+        Returns
+        -------
+        dict
+            JSON serializable results: {"llgram": version, "python": version, "scales": {scale: metrics}}
+    """
+    results = {}
+    for name in (scales or SCALES):
+        scale = SCALES[name]
+        grammar = randomGrammar(scale["rules"], scale["nonterminals"], scale["terminals"], nullable, rightLength, seed=seed)
+        metrics, counters = _phases(grammar, repeat)
+
+        generator = TableGenerator(grammar)
+        metrics["generatePeakBytes"] = _peak(lambda: TableGenerator(grammar))
+        metrics["compile"] = _best(repeat, lambda: CompiledTable.fromGenerator(generator))
+
+        parser = LLParser(CompiledTable.fromGenerator(generator))
+        sentence = SentenceGenerator(generator).sentence(scale["length"], seed)
+        metrics["parse"] = _best(repeat, lambda: parser.parseRuleIds(sentence))
+        metrics["tokensPerSecond"] = len(sentence) / metrics["parse"] if metrics["parse"] else 0.0
+        metrics["parsePeakBytes"] = _peak(lambda: parser.parseRuleIds(sentence))
+
+        metrics["compress"] = _best(repeat, lambda: CompiledTable.fromGenerator(generator, compress=True))
+        compressed = LLParser(CompiledTable.fromGenerator(generator, compress=True))
+        metrics["compressionRatio"] = compressed.compiled.compressionRatio()
+        metrics["parseCompressed"] = _best(repeat, lambda: compressed.parseRuleIds(sentence))
+        metrics["accepts"] = _best(repeat, lambda: parser.accepts(sentence))
+
+        stats = Stats()
+        LLParser(parser.compiled, stats=stats).parseRuleIds(sentence)
+        counters.update(stats.counters)
+
+        results[name] = {
+            "grammar":{"rules":len(generator.getRules()), "nonterminals":len(generator.getNonterminals()), "terminals":len(generator.getTerminals())},
+            "tokens":len(sentence),
+            "metrics":metrics,
+            "counters":counters,
+        }
+
+    return {"llgram":llgram.__version__, "python":platform.python_version(), "scales":results}
+
+def compare(results: dict, baseline: dict, tolerance: float=0.2) -> list:
+    """
+        Compares results of run against a baseline (results of an earlier run).
+
+        Parameters
+        ----------
+        results: dict
+            Current results
+
+        baseline: dict
+            Stored results
+
+        tolerance: float
+            Allowed relative change, e.g. 0.2 allows a step to be 20% slower
+
+        Returns
+        -------
+        list
+            Descriptions of the regressions, empty if there are none
+    """
+    regressions = []
+    for name, scale in results["scales"].items():
+        base = baseline.get("scales", {}).get(name)
+        if base is None:
+            continue
+        for metric, higherIsBetter in METRICS.items():
+            current = scale["metrics"].get(metric)
+            previous = base["metrics"].get(metric)
+            if current is None or not previous:
+                continue
+            change = current / previous - 1
+            if (higherIsBetter and change < -tolerance) or (not higherIsBetter and change > tolerance):
+                regressions.append(f"{name} {metric}: {previous:.6g} -> {current:.6g} ({change:+.1%})")
+    return regressions
+
+def _phases(grammar, repeat):
+    #best time of every phase of TableGenerator and of the whole construction, and the counters of the generator
+    metrics = {}
+    for _ in range(repeat):
+        stats = Stats()
+        start = time.perf_counter()
+        TableGenerator(grammar, stats=stats)
+        elapsed = time.perf_counter() - start
+        metrics["generate"] = min(metrics.get("generate", elapsed), elapsed)
+        for phase in PHASES:
+            seconds = stats.timings.get(phase, 0.0)
+            metrics[phase] = min(metrics.get(phase, seconds), seconds)
+    return metrics, dict(stats.counters)
+
+def _best(repeat, step, setup=None):
+    #shortest time of repeat runs of step, the result of the (untimed) setup is passed to step
+    best = None
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        step(*arguments)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _peak(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
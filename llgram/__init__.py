@@ -1 +1,3 @@
-__all__=["generation", "LLExceptions", "constants"]
\ No newline at end of file
+__version__ = "0.2.0"
+
+__all__=["generation", "LLExceptions", "constants", "compiled", "analysis", "cache", "serialization", "codegen", "tree", "stats", "tokenizer", "server", "client", "protocol"]
\ No newline at end of file
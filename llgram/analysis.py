@@ -0,0 +1,707 @@
+from llgram import constants as const
+
+class SetBackend:
+    """
+        Represents symbol sets as python sets.
+    """
+    def empty(self):
+        return set()
+
+    def single(self, symbol):
+        return {symbol}
+
+    def unite(self, target, other):
+        """
+            Adds other to target. The target is modified in place, the result has to be used in place of target.
+        """
+        target |= other
+        return target
+
+    def grow(self, target, other):
+        """
+            Like unite, also returns True if target gained a member.
+        """
+        size = len(target)
+        target |= other
+        return target, len(target) != size
+
+    def contains(self, value, symbol) -> bool:
+        return symbol in value
+
+    def without(self, value, symbol):
+        return value.difference({symbol})
+
+    def copy(self, value):
+        return value.copy()
+
+    def toSet(self, value) -> set:
+        return value
+
+class BitsetBackend:
+    def __init__(self, symbols):
+        """
+            Represents symbol sets as python ints, where every symbol owns one bit.
+            Union, difference and comparison of two sets are single integer operations and ints are immutable, so sets can be shared freely.
+
+            Parameters
+            ----------
+            symbols: iterable
+                Symbols which can be members of the sets (terminals, epsilon and the end symbol)
+        """
+        self.symbols = list(dict.fromkeys(symbols))
+        self.positions = {symbol:i for i, symbol in enumerate(self.symbols)} #bit positions, the masks themselves would take quadratic memory
+
+    def empty(self):
+        return 0
+
+    def single(self, symbol):
+        return 1 << self.positions[symbol]
+
+    def add(self, symbol):
+        """
+            Numbers a new symbol, existing bitmasks stay valid.
+        """
+        if symbol not in self.positions:
+            self.positions[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def unite(self, target, other):
+        return target | other
+
+    def grow(self, target, other):
+        result = target | other
+        return result, result != target
+
+    def contains(self, value, symbol) -> bool:
+        return (value >> self.positions[symbol]) & 1 == 1
+
+    def without(self, value, symbol):
+        return value & ~(1 << self.positions[symbol])
+
+    def copy(self, value):
+        return value
+
+    def toSet(self, value) -> set:
+        symbols = self.symbols
+        result = set()
+        bits = bin(value)[:1:-1] #least significant bit first
+        i = bits.find("1")
+        while i >= 0:
+            result.add(symbols[i])
+            i = bits.find("1", i + 1)
+        return result
+
+    def fromSet(self, value) -> int:
+        positions = self.positions
+        packed = bytearray((len(positions) + 7) // 8)
+        for symbol in value:
+            position = positions[symbol]
+            packed[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(packed, "little")
+
+class GrammarAnalysis:
+    def __init__(self, rules: list, startSymbol: str, nonterminals: set, terminals: set, bitsets: bool=False):
+        """
+            Computes the empty, first and follow sets of a grammar.
+
+            Every analysis is solved on a dependency graph of the symbols: the graph is condensed into strongly connected
+            components, which are then resolved in topological order, so every set is computed exactly once.
+
+            Parameters
+            ----------
+            rules: list
+                Rules of the grammar
+
+            startSymbol: str
+                Starting symbol of the grammar
+
+            nonterminals: set
+                Nonterminals of the grammar
+
+            terminals: set
+                Terminals of the grammar (may contain the epsilon symbol)
+
+            bitsets: bool
+                If true, first and follow sets are represented as int bitmasks (see BitsetBackend), otherwise as python sets
+        """
+        self.rules = rules
+        self.startSymbol = startSymbol
+        self.nonterminals = nonterminals
+        self.terminals = terminals
+
+        self.bitsets = BitsetBackend([const.END_SYMBOL, const.EPSILON_SYMBOL] + sorted(terminals))
+        self.backend = self.bitsets if bitsets else SetBackend()
+
+        self.__index()
+
+        #first and follow sets are stored in the representation of the backend
+        self.emptySets = {} #True if the symbol can derive an empty string
+        self.firstSets = {} #first sets, containing epsilon for symbols that can derive an empty string
+        self.followSets = {}
+
+        self.__first = {} #first sets without epsilon
+
+    def __index(self):
+        self.rulesByLeft = {} #nonterminal:[rules with the nonterminal on the left hand side]
+        self.occurrences = {} #symbol:[(rule, position of the symbol in the right hand side)]
+        for rule in self.rules:
+            self.__indexRule(rule)
+
+    def __indexRule(self, rule):
+        self.rulesByLeft.setdefault(rule.getLeft(), []).append(rule)
+        for i, symbol in enumerate(rule.getRight()):
+            self.occurrences.setdefault(symbol, []).append((rule, i))
+
+    def __unindexRule(self, rule):
+        #rules are compared by identity, the grammar can contain equal rules
+        left = rule.getLeft()
+        rules = self.rulesByLeft[left]
+        del rules[next(i for i, other in enumerate(rules) if other is rule)]
+        if not rules:
+            del self.rulesByLeft[left]
+        for i, symbol in enumerate(rule.getRight()):
+            occurrences = self.occurrences[symbol]
+            del occurrences[next(j for j, (other, position) in enumerate(occurrences) if other is rule and position == i)]
+            if not occurrences:
+                del self.occurrences[symbol]
+
+    def __getstate__(self):
+        #the indexes are cheaper to rebuild than to unpickle
+        state = self.__dict__.copy()
+        del state["rulesByLeft"]
+        del state["occurrences"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__index()
+
+    def computeEmptySets(self, nonterminals: set=None):
+        """
+            Finds all symbols which can derive an empty string.
+            A rule becomes nullable once the count of its symbols not yet known to be nullable drops to zero.
+
+            Parameters
+            ----------
+            nonterminals: set
+                If given, only these nonterminals are recomputed and the empty sets of all other symbols are considered final
+
+            Returns
+            -------
+            int
+                Number of worklist iterations (nullable nonterminals found)
+        """
+        if nonterminals is None:
+            empty = {symbol:False for symbol in self.nonterminals.union(self.terminals)}
+            if const.EPSILON_SYMBOL in empty:
+                empty[const.EPSILON_SYMBOL] = True
+            self.emptySets = empty
+            rules = self.rules
+        else:
+            empty = self.emptySets
+            for nonterminal in nonterminals:
+                empty[nonterminal] = False
+            rules = [rule for nonterminal in nonterminals for rule in self.rulesByLeft.get(nonterminal, ())]
+
+        #counted before any symbol is marked, marked symbols are subtracted from the counts through the worklist
+        remaining = {id(rule):sum(1 for symbol in rule.getRight() if not empty[symbol]) for rule in rules}
+        worklist = []
+        for rule in rules:
+            if remaining[id(rule)] == 0 and not empty[rule.getLeft()]:
+                empty[rule.getLeft()] = True
+                worklist.append(rule.getLeft())
+
+        iterations = 0
+        while worklist:
+            symbol = worklist.pop()
+            iterations += 1
+            for rule, _ in self.occurrences.get(symbol, ()):
+                if id(rule) not in remaining:
+                    continue #the left hand side is not being recomputed
+                remaining[id(rule)] -= 1
+                if remaining[id(rule)] == 0 and not empty[rule.getLeft()]:
+                    empty[rule.getLeft()] = True
+                    worklist.append(rule.getLeft())
+        return iterations
+
+    def computeFirstSets(self):
+        """
+            Computes the first sets of all symbols. Requires the empty sets.
+
+            The first set of a nonterminal depends on the first sets of the nonterminals that can start its rules.
+
+            Returns
+            -------
+            int
+                Number of strongly connected components of the dependency graph
+        """
+        backend = self.backend
+        first = self.__first
+
+        for terminal in self.terminals:
+            first[terminal] = backend.single(terminal) if terminal != const.EPSILON_SYMBOL else backend.empty()
+        components = _solve(self.nonterminals, self.__firstDependencies, self.__firstBase, first, backend)
+
+        self.firstSets = {symbol:self.__withEpsilon(symbol, first[symbol]) for symbol in self.nonterminals.union(self.terminals)}
+        return components
+
+    def computeFollowSets(self):
+        """
+            Computes the follow sets of all nonterminals. Requires the empty and first sets.
+
+            The follow set of a nonterminal depends on the follow sets of the left hand sides of the rules it can end.
+
+            Returns
+            -------
+            int
+                Number of strongly connected components of the dependency graph
+        """
+        follow = {}
+        components = _solve(self.nonterminals, self.__followDependencies, self.__followBase, follow, self.backend)
+        self.followSets = follow
+        return components
+
+    def computeTerminalSets(self):
+        """
+            Sets the empty and first sets of the terminals, which the ensure methods build on.
+        """
+        backend = self.backend
+        for terminal in self.terminals:
+            self.emptySets[terminal] = terminal == const.EPSILON_SYMBOL
+            self.__first[terminal] = backend.single(terminal) if terminal != const.EPSILON_SYMBOL else backend.empty()
+            self.firstSets[terminal] = self.__withEpsilon(terminal, self.__first[terminal])
+
+    def ensureEmptySets(self, nonterminals):
+        """
+            Computes the empty sets of the nonterminals and of every nonterminal they can derive, unless they are known already.
+            Requires computeTerminalSets.
+        """
+        empty = self.emptySets
+        region = set()
+        stack = [nonterminal for nonterminal in nonterminals if nonterminal not in empty]
+        while stack:
+            nonterminal = stack.pop()
+            if nonterminal in region:
+                continue
+            region.add(nonterminal)
+            for rule in self.rulesByLeft.get(nonterminal, ()):
+                stack.extend(symbol for symbol in rule.getRight() if symbol not in empty and symbol not in region)
+        if region:
+            self.computeEmptySets(region)
+
+    def ensureFirstSets(self, symbols):
+        """
+            Computes the first sets of the symbols and of the nonterminals they depend on, unless they are known already.
+            Only the part of the grammar the symbols can derive is analysed. Requires computeTerminalSets.
+        """
+        roots = [symbol for symbol in symbols if symbol not in self.__first]
+        if not roots:
+            return
+        self.ensureEmptySets(roots)
+        solved = []
+        _solve(roots, self.__firstDependencies, self.__firstBase, self.__first, self.backend, solved)
+        for symbol in solved:
+            self.firstSets[symbol] = self.__withEpsilon(symbol, self.__first[symbol])
+
+    def ensureFollowSets(self, nonterminals):
+        """
+            Computes the follow sets of the nonterminals, unless they are known already. Only the rules containing the nonterminals,
+            the rules containing the left hand sides of those where the nonterminal can end the rule (and so on)
+            and the symbols after the nonterminals are analysed.
+            Requires computeTerminalSets.
+        """
+        follow = self.followSets
+        roots = [nonterminal for nonterminal in nonterminals if nonterminal not in follow]
+        if not roots:
+            return
+        #the follow set of a nonterminal contains the first sets of the symbols after it in the rules containing it,
+        #and the follow set of the left hand side of such a rule if the symbols after it can derive an empty string
+        empty = self.emptySets
+        region = set()
+        stack = list(roots)
+        while stack:
+            nonterminal = stack.pop()
+            if nonterminal in region:
+                continue
+            region.add(nonterminal)
+            for rule, i in self.occurrences.get(nonterminal, ()):
+                suffix = rule.getRight()[i+1:]
+                self.ensureFirstSets(suffix)
+                left = rule.getLeft()
+                if left not in follow and left not in region and all(empty[symbol] for symbol in suffix):
+                    stack.append(left)
+        _solve(roots, self.__followDependencies, self.__followBase, follow, self.backend)
+
+    def update(self, added: list, removed: list):
+        """
+            Updates the analysis after rules were added to or removed from the grammar, recomputing only the sets that can change.
+            The caller adds the rules to or removes them from self.rules.
+
+            Added rules can only extend sets, the new members are propagated along the dependency graph until nothing changes.
+            Removed rules can shrink sets, so the affected sets are cleared together with every set depending on them and solved again.
+            Sets outside of these regions are kept.
+
+            Parameters
+            ----------
+            added: list
+                Rules added to the grammar
+
+            removed: list
+                Rules removed from the grammar
+
+            Returns
+            -------
+            list
+                Rules whose first sets could have changed
+
+            set
+                Nonterminals whose table rows could have changed
+
+            None is returned instead if a symbol would change between a terminal and a nonterminal,
+            the analysis then has to be recomputed for the whole grammar.
+        """
+        backend = self.backend
+        nonterminals = self.nonterminals
+        occurrences = self.occurrences
+        empty = self.emptySets
+        first = self.__first
+        follow = self.followSets
+
+        if any(rule.getLeft() in self.terminals for rule in added):
+            return None
+
+        for rule in removed:
+            self.__unindexRule(rule)
+        for rule in added:
+            self.__indexRule(rule)
+        if not self.__updateSymbols(added, removed):
+            return None
+
+        removedLeft = {rule.getLeft() for rule in removed}
+
+        #empty sets
+        shrinking = _closure((symbol for symbol in removedLeft if symbol in nonterminals and empty[symbol]), self.__emptyDependents)
+        self.computeEmptySets(shrinking)
+        gainedEmpty = {symbol for symbol in self.__growEmpty(added) if symbol not in shrinking}
+        lostEmpty = {symbol for symbol in shrinking if not empty[symbol]}
+        changedEmpty = lostEmpty | gainedEmpty
+
+        #first sets
+        seeds = {symbol for symbol in removedLeft if symbol in nonterminals}
+        for symbol in lostEmpty:
+            seeds.update(rule.getLeft() for rule, _ in occurrences.get(symbol, ()))
+        shrinking = _closure(seeds, self.__firstDependents)
+        old = {symbol:first.pop(symbol) for symbol in shrinking}
+        _solve(shrinking, self.__firstDependencies, self.__firstBase, first, backend)
+
+        seeds = [(rule.getLeft(), self.__uniteFirstOfString(backend.empty(), rule.getRight())) for rule in added]
+        for symbol in gainedEmpty:
+            for rule, _ in occurrences.get(symbol, ()):
+                seeds.append((rule.getLeft(), self.__uniteFirstOfString(backend.empty(), rule.getRight())))
+        grownFirst = _grow(seeds, self.__firstDependents, first, backend)
+
+        shrunkFirst = {symbol for symbol in shrinking if old[symbol] != first[symbol]}
+        changedFirst = shrunkFirst | grownFirst
+        for symbol in changedFirst | changedEmpty:
+            self.firstSets[symbol] = self.__withEpsilon(symbol, first[symbol])
+
+        #follow sets
+        seeds = set()
+        for rule in removed:
+            seeds.update(symbol for symbol in rule.getRight() if symbol in nonterminals)
+        for symbol in shrunkFirst | lostEmpty:
+            for rule, i in occurrences.get(symbol, ()):
+                seeds.update(other for other in rule.getRight()[:i] if other in nonterminals)
+        shrinking = _closure(seeds, self.__followDependents)
+        old = {symbol:follow.pop(symbol) for symbol in shrinking}
+        _solve(shrinking, self.__followDependencies, self.__followBase, follow, backend)
+
+        seeds = []
+        for rule in added:
+            seeds.extend(self.__followOfOccurrences(rule, len(rule.getRight())))
+        for symbol in grownFirst | gainedEmpty:
+            for rule, i in occurrences.get(symbol, ()):
+                seeds.extend(self.__followOfOccurrences(rule, i))
+        grownFollow = _grow(seeds, self.__followDependents, follow, backend)
+
+        changedFollow = {symbol for symbol in shrinking if old[symbol] != follow[symbol]} | grownFollow
+
+        #a rule first set changes with the first or empty set of one of its symbols
+        rules = {id(rule):rule for rule in added}
+        for symbol in changedFirst | changedEmpty:
+            for rule, _ in occurrences.get(symbol, ()):
+                rules[id(rule)] = rule
+        rules = list(rules.values())
+
+        rows = removedLeft | changedFollow
+        rows.update(rule.getLeft() for rule in rules)
+        return rules, rows
+
+    def __updateSymbols(self, added, removed):
+        #registers the symbols of added rules and forgets the symbols no longer used, False if a symbol would be reclassified
+        backend = self.backend
+        for rule in added:
+            left = rule.getLeft()
+            if left not in self.nonterminals:
+                self.nonterminals.add(left)
+                self.emptySets[left] = False
+                self.__first[left] = backend.empty()
+                self.firstSets[left] = backend.empty()
+                self.followSets[left] = backend.single(const.END_SYMBOL) if left == self.startSymbol else backend.empty()
+        for rule in added:
+            for symbol in rule.getRight():
+                if symbol not in self.nonterminals and symbol not in self.terminals:
+                    self.terminals.add(symbol)
+                    self.bitsets.add(symbol)
+                    self.emptySets[symbol] = symbol == const.EPSILON_SYMBOL
+                    self.__first[symbol] = backend.single(symbol) if symbol != const.EPSILON_SYMBOL else backend.empty()
+                    self.firstSets[symbol] = self.__withEpsilon(symbol, self.__first[symbol])
+
+        for rule in removed:
+            for symbol in [rule.getLeft()] + rule.getRight():
+                if symbol in self.rulesByLeft or symbol not in self.emptySets:
+                    continue
+                if symbol in self.occurrences:
+                    if symbol in self.nonterminals:
+                        return False #a nonterminal without rules
+                    continue
+                self.nonterminals.discard(symbol)
+                self.terminals.discard(symbol)
+                for sets in (self.emptySets, self.__first, self.firstSets, self.followSets):
+                    sets.pop(symbol, None)
+        return True
+
+    def __growEmpty(self, added):
+        #marks the symbols which can derive an empty string through the added rules, returns the newly marked ones
+        empty = self.emptySets
+        grown = set()
+        worklist = [rule.getLeft() for rule in added if not empty[rule.getLeft()] and self.__emptyOfString(rule.getRight())]
+        for symbol in worklist:
+            empty[symbol] = True
+        while worklist:
+            symbol = worklist.pop()
+            grown.add(symbol)
+            for rule, _ in self.occurrences.get(symbol, ()):
+                left = rule.getLeft()
+                if not empty[left] and self.__emptyOfString(rule.getRight()):
+                    empty[left] = True
+                    worklist.append(left)
+        return grown
+
+    def __emptyDependents(self, symbol):
+        #nullable nonterminals with a rule containing the symbol
+        for rule, _ in self.occurrences.get(symbol, ()):
+            if self.emptySets[rule.getLeft()]:
+                yield rule.getLeft()
+
+    def __firstDependencies(self, nonterminal):
+        for rule in self.rulesByLeft.get(nonterminal, ()):
+            for symbol in rule.getRight():
+                if symbol in self.nonterminals:
+                    yield symbol
+                if not self.emptySets[symbol]:
+                    break
+
+    def __firstBase(self, nonterminal):
+        backend = self.backend
+        result = backend.empty()
+        for rule in self.rulesByLeft.get(nonterminal, ()):
+            for symbol in rule.getRight():
+                if symbol not in self.nonterminals and symbol != const.EPSILON_SYMBOL:
+                    result = backend.unite(result, backend.single(symbol))
+                if not self.emptySets[symbol]:
+                    break
+        return result
+
+    def __firstDependents(self, symbol):
+        #nonterminals whose first sets contain the first set of the symbol
+        for rule, i in self.occurrences.get(symbol, ()):
+            if self.__emptyOfString(rule.getRight()[:i]):
+                yield rule.getLeft()
+
+    def __followDependencies(self, nonterminal):
+        for rule, i in self.occurrences.get(nonterminal, ()):
+            if self.__emptyOfString(rule.getRight()[i+1:]):
+                yield rule.getLeft()
+
+    def __followBase(self, nonterminal):
+        backend = self.backend
+        result = backend.empty()
+        if nonterminal == self.startSymbol:
+            result = backend.unite(result, backend.single(const.END_SYMBOL))
+        for rule, i in self.occurrences.get(nonterminal, ()):
+            result = self.__uniteFirstOfString(result, rule.getRight()[i+1:])
+        return result
+
+    def __followDependents(self, nonterminal):
+        #nonterminals whose follow sets contain the follow set of the nonterminal
+        for rule in self.rulesByLeft.get(nonterminal, ()):
+            for symbol in reversed(rule.getRight()):
+                if symbol in self.nonterminals:
+                    yield symbol
+                if not self.emptySets[symbol]:
+                    break
+
+    def __followOfOccurrences(self, rule, end):
+        #(nonterminal, its follow set within the rule) for the nonterminals among the first end symbols of the rule
+        backend = self.backend
+        right = rule.getRight()
+        for i in range(end):
+            if right[i] in self.nonterminals:
+                suffix = right[i+1:]
+                result = self.__uniteFirstOfString(backend.empty(), suffix)
+                if self.__emptyOfString(suffix):
+                    result = backend.unite(result, self.followSets[rule.getLeft()])
+                yield right[i], result
+
+    def firstOfString(self, string):
+        """
+            Returns the first set of a string of symbols, containing epsilon if the whole string can derive an empty string.
+            Requires the empty and first sets.
+        """
+        backend = self.backend
+        result = self.__uniteFirstOfString(backend.empty(), string)
+        if self.__emptyOfString(string):
+            result = backend.unite(result, backend.single(const.EPSILON_SYMBOL))
+        return result
+
+    def toSet(self, value) -> set:
+        """
+            Converts a set in the representation of the backend to a python set.
+        """
+        return self.backend.toSet(value)
+
+    def toBitset(self, value) -> int:
+        """
+            Converts a set in the representation of the backend to an int bitmask (see self.bitsets for the numbering).
+        """
+        if self.backend is self.bitsets:
+            return value
+        return self.bitsets.fromSet(value)
+
+    def __uniteFirstOfString(self, result, string):
+        backend = self.backend
+        for symbol in string:
+            result = backend.unite(result, self.__first[symbol])
+            if not self.emptySets[symbol]:
+                break
+        return result
+
+    def __emptyOfString(self, string):
+        for symbol in string:
+            if not self.emptySets[symbol]:
+                return False
+        return True
+
+    def __withEpsilon(self, symbol, first):
+        backend = self.backend
+        result = backend.copy(first)
+        if self.emptySets[symbol]:
+            result = backend.unite(result, backend.single(const.EPSILON_SYMBOL))
+        return result
+
+def _solve(roots, dependencies, base, values, backend, solved=None):
+    """
+        Computes values[node] = base(node) united with values[dependency] for every dependency of the node,
+        for all nodes reachable from roots.
+
+        The dependency graph is walked with an iterative version of Tarjan's algorithm. Strongly connected components
+        are completed in reverse topological order, so when a component is finished all of its outside dependencies are final
+        and the whole component shares one value. Nodes already present in values are considered final.
+
+        Returns the number of strongly connected components solved. The nodes solved are appended to the solved list, if given.
+    """
+    index = {}
+    low = {}
+    stack = []
+    onStack = set()
+    counter = 0
+    components = 0
+
+    for root in roots:
+        if root in values or root in index:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        onStack.add(root)
+        work = [(root, iter(dependencies(root)))]
+
+        while work:
+            node, edges = work[-1]
+            for dependency in edges:
+                if dependency in values:
+                    continue
+                if dependency not in index:
+                    index[dependency] = low[dependency] = counter
+                    counter += 1
+                    stack.append(dependency)
+                    onStack.add(dependency)
+                    work.append((dependency, iter(dependencies(dependency))))
+                    break
+                if dependency in onStack and index[dependency] < low[node]:
+                    low[node] = index[dependency]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    #node is the root of a strongly connected component
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+
+                    value = backend.empty()
+                    for member in members:
+                        value = backend.unite(value, base(member))
+                        for dependency in dependencies(member):
+                            if dependency in values:
+                                value = backend.unite(value, values[dependency])
+                    for member in members:
+                        values[member] = backend.copy(value)
+                    if solved is not None:
+                        solved.extend(members)
+                    components += 1
+
+    return components
+
+def _closure(seeds, dependents) -> set:
+    """
+        Returns the seeds and all nodes reachable from them through dependents.
+    """
+    result = set(seeds)
+    stack = list(result)
+    while stack:
+        for dependent in dependents(stack.pop()):
+            if dependent not in result:
+                result.add(dependent)
+                stack.append(dependent)
+    return result
+
+def _grow(seeds, dependents, values, backend) -> set:
+    """
+        Unites the (node, value) seeds into values and propagates every change to the dependents of the changed node,
+        which contain the value of the node. Returns the nodes whose values changed.
+    """
+    grown = set()
+    worklist = []
+    for node, value in seeds:
+        values[node], changed = backend.grow(values[node], value)
+        if changed:
+            grown.add(node)
+            worklist.append(node)
+    while worklist:
+        node = worklist.pop()
+        for dependent in dependents(node):
+            values[dependent], changed = backend.grow(values[dependent], values[node])
+            if changed:
+                grown.add(dependent)
+                worklist.append(dependent)
+    return grown
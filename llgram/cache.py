@@ -0,0 +1,308 @@
+import gc
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import llgram
+from llgram.generation import TableGenerator
+
+CACHE_SUFFIX = ".llgram"
+CACHE_FORMAT = 2 #layout of the stored generators, part of the key, bump it whenever the attributes of TableGenerator change
+
+def defaultCacheDirectory() -> str:
+    """
+        Returns the default directory of the table cache ($XDG_CACHE_HOME/llgram or ~/.cache/llgram)
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "llgram")
+
+class TableCache:
+    def __init__(self, directory: str=None, maxBytes: int=256 * 1024 * 1024, memoSize: int=16):
+        """
+            Content addressed cache of generated tables.
+
+            A generated TableGenerator (table, start symbol, rules, empty, first and follow sets) is stored in the cache directory
+            under a hash of the grammar text, the generator options and the llgram version. On a hit the generator is loaded
+            without running any analysis. Entries are written atomically, so concurrent processes can share one directory.
+            When the directory grows over maxBytes, the least recently used entries are removed.
+
+            Generators are also memoized in this process, repeated requests for the same grammar return the same object
+            until it is edited (see TableGenerator.add_rule), then the grammar is loaded again.
+
+            Parameters
+            ----------
+            directory: str
+                Cache directory, defaults to defaultCacheDirectory(). Entries are unpickled, so anyone who can write to the directory
+                can run code in the processes using the cache: it has to be trusted, never a shared directory such as /tmp.
+                A new directory is created accessible to its owner only.
+
+            maxBytes: int
+                Size limit of the cache directory in bytes
+
+            memoSize: int
+                Number of generators memoized in this process, 0 disables the memo
+        """
+        self.directory = directory if directory is not None else defaultCacheDirectory()
+        self.maxBytes = maxBytes
+        self.memoSize = memoSize
+
+        self.__memo = OrderedDict() #key:(generator, its version when memoized)
+        self.__lock = threading.Lock()
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True) #only the owner can plant entries, see directory
+
+    def key(self, grammar: str, bitsets: bool=False) -> str:
+        """
+            Returns the cache key of a grammar
+
+            Returns
+            -------
+            str
+                Hex digest identifying the grammar, the options, the llgram version and the format of the entries
+        """
+        digest = hashlib.sha256()
+        digest.update(f"llgram {llgram.__version__} format={CACHE_FORMAT} bitsets={bitsets}\n".encode("utf-8"))
+        digest.update(grammar.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, grammar: str, bitsets: bool=False) -> TableGenerator:
+        """
+            Returns a generator for the grammar, either from the cache or newly generated (and then stored in the cache).
+
+            Parameters
+            ----------
+            grammar: str
+                String containing the grammar
+
+            bitsets: bool
+                Passed to TableGenerator
+
+            Returns
+            -------
+            TableGenerator
+                Generator of the grammar
+
+            Raises
+            ------
+            GrammarNotLL1Exception
+                If the provided grammar is not LL(1)
+        """
+        key = self.key(grammar, bitsets)
+
+        with self.__lock:
+            memoized = self.__memo.get(key)
+            if memoized is not None:
+                generator, version = memoized
+                if generator.getVersion() == version:
+                    self.__memo.move_to_end(key)
+                    return generator
+                del self.__memo[key] #edited, it no longer is the generator of the grammar
+
+        generator = self.__load(key)
+        if generator is None:
+            generator = TableGenerator(grammar, bitsets=bitsets)
+            self.__store(key, generator)
+
+        if self.memoSize > 0:
+            with self.__lock:
+                self.__memo[key] = (generator, generator.getVersion())
+                while len(self.__memo) > self.memoSize:
+                    self.__memo.popitem(last=False)
+        return generator
+
+    def clear(self):
+        """
+            Removes all entries from the cache directory and the memo
+        """
+        with self.__lock:
+            self.__memo.clear()
+        for path, _, _ in self.__entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def __load(self, key):
+        path = self.__path(key)
+        #the collector would repeatedly scan the many objects created while loading
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as fin:
+                generator = pickle.load(fin)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            #a damaged or incompatible entry is regenerated
+            return None
+        finally:
+            if collecting:
+                gc.enable()
+        if not _isComplete(generator):
+            return None
+
+        try:
+            os.utime(path) #mark the entry as recently used
+        except OSError:
+            pass
+        return generator
+
+    def __store(self, key, generator):
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fout:
+                pickle.dump(generator, fout, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.__path(key))
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+        self.__evict()
+
+    def __entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def __evict(self):
+        entries = self.__entries()
+        total = sum(size for _, _, size in entries)
+        entries.sort(key=lambda entry: entry[1])
+        for path, _, size in entries:
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+_generatorAttributes = None #attributes every TableGenerator has, see _isComplete
+
+def _isComplete(generator):
+    #an entry of an older layout unpickles fine but lacks attributes of the current one
+    global _generatorAttributes
+    if not isinstance(generator, TableGenerator):
+        return False
+    if _generatorAttributes is None:
+        _generatorAttributes = frozenset(TableGenerator("S -> epsilon").__dict__)
+    return _generatorAttributes <= generator.__dict__.keys()
+
+class ParseResultCache:
+    def __init__(self, maxEntries: int=4096, maxBytes: int=64 * 1024 * 1024):
+        """
+            In-memory LRU cache of parse results for repeated inputs (see the cache parameter of llgram.parsing.LLParser).
+
+            Results are keyed by the tuple of input terminals (through its hash), a result is either the derivation
+            as an array of rule IDs or the exception the input failed with. When the cache holds more than maxEntries results
+            or their estimated size exceeds maxBytes, the least recently used ones are evicted. The numbers of hits, misses
+            and evictions are kept in the hits, misses and evictions attributes.
+
+            The cache can be used by many threads at once. Results are keyed by the input only,
+            so a cache must not be shared by parsers of different tables.
+
+            Parameters
+            ----------
+            maxEntries: int
+                Maximal number of cached results
+
+            maxBytes: int
+                Maximal estimated size of the cached inputs and results in bytes, a larger single result is not cached
+        """
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__entries = OrderedDict() #terminals:(result, size)
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+
+    def get(self, terminals: tuple):
+        """
+            Returns the cached result of the input and marks it as recently used, or None if the input isn't cached.
+
+            Returns
+            -------
+            array or ParsingException
+                Rule IDs of the derivation or the exception of a failed parse, None on a miss
+        """
+        with self.__lock:
+            entry = self.__entries.get(terminals)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(terminals)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, terminals: tuple, result):
+        """
+            Stores the result of an input, evicting the least recently used results over the limits.
+
+            Parameters
+            ----------
+            terminals: tuple
+                Input terminals
+
+            result: array or ParsingException
+                Rule IDs of the derivation or the exception of a failed parse, the cache keeps a reference to it
+        """
+        size = sys.getsizeof(terminals) + sys.getsizeof(result)
+        if isinstance(result, Exception):
+            size += sys.getsizeof(result.args[0]) if result.args else 0
+        if size > self.maxBytes or self.maxEntries <= 0:
+            return
+
+        with self.__lock:
+            old = self.__entries.pop(terminals, None)
+            if old is not None:
+                self.__bytes -= old[1]
+            self.__entries[terminals] = (result, size)
+            self.__bytes += size
+            while len(self.__entries) > self.maxEntries or self.__bytes > self.maxBytes:
+                _, (_, evicted) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """
+            Removes all results, the statistics are kept
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def size(self) -> int:
+        """
+            Returns the estimated size of the cached inputs and results in bytes
+        """
+        return self.__bytes
+
+    def asDict(self) -> dict:
+        """
+            Returns the statistics of the cache (hits, misses, evictions, entries and bytes) as a JSON serializable dictionary
+        """
+        with self.__lock:
+            return {"hits":self.hits, "misses":self.misses, "evictions":self.evictions, "entries":len(self.__entries), "bytes":self.__bytes}
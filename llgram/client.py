@@ -0,0 +1,215 @@
+import json
+import socket
+import itertools
+
+from llgram import llexceptions as lle
+from llgram.rule import Rule
+from llgram.protocol import HEADER, MAX_MESSAGE, PARSE, VALIDATE, RULES, encodeMessage, readMessage
+
+#asyncio and the parser are imported only where they are used, so that short-lived processes using Client import little
+
+class Client:
+    def __init__(self, path: str=None, host: str="127.0.0.1", port: int=7420, timeout: float=None):
+        """
+            Blocking client of llgram.server.ParseServer. Requests are sent one at a time, for many requests in flight
+            use AsyncClient.
+
+            Parameters
+            ----------
+            path: str
+                Unix socket of the server, if omitted the server is reached over TCP
+
+            host: str
+                TCP host of the server
+
+            port: int
+                TCP port of the server
+
+            timeout: float
+                Socket timeout in seconds, None to wait forever
+        """
+        if path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout)
+            self.socket.connect(path)
+        else:
+            self.socket = socket.create_connection((host, port), timeout)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.__ids = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.socket.close()
+
+    def request(self, op: str, grammar: str, tokens=None) -> dict:
+        """
+            Sends a request and returns the response of the server as it is, see llgram.server for the operations.
+        """
+        request = {"id":next(self.__ids), "op":op, "grammar":grammar}
+        if tokens is not None:
+            request["tokens"] = list(tokens)
+        self.socket.sendall(encodeMessage(request))
+        size, = HEADER.unpack(self.__receive(HEADER.size))
+        if size > MAX_MESSAGE:
+            raise ValueError(f"Message of {size} bytes is longer than {MAX_MESSAGE} bytes")
+        return json.loads(self.__receive(size))
+
+    def parse(self, grammar: str, tokens) -> list:
+        """
+            Parses the tokens with the grammar served under the given name.
+
+            Returns
+            -------
+            list
+                Leftmost derivation as rule IDs, indexing the rules returned by rules
+
+            Raises
+            ------
+            ParsingSyntaxException, ParsingLexicalException
+                If the tokens are not a sentence of the grammar
+        """
+        return _result(self.request(PARSE, grammar, tokens))["derivation"]
+
+    def validate(self, grammar: str, tokens) -> "AcceptResult":
+        """
+            Checks the tokens with the grammar served under the given name, see llgram.parsing.LLParser.accepts
+        """
+        return _acceptResult(_result(self.request(VALIDATE, grammar, tokens)))
+
+    def rules(self, grammar: str) -> list:
+        """
+            Returns the rules of the grammar served under the given name, indexed by the rule IDs of derivations
+        """
+        return _rules(_result(self.request(RULES, grammar)))
+
+    def __receive(self, size):
+        chunks = []
+        while size:
+            chunk = self.socket.recv(min(size, 1 << 20))
+            if not chunk:
+                raise ConnectionError("The server closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+class AsyncClient:
+    def __init__(self, reader, writer):
+        """
+            asyncio client of llgram.server.ParseServer, created by connect. Any number of requests can be in flight at once
+            (e.g. started with asyncio.gather), the responses are matched to them by their IDs.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.__ids = itertools.count()
+        self.__pending = {} #request ID:future of the response
+        import asyncio
+        self.__receiver = asyncio.ensure_future(self.__receive())
+
+    @classmethod
+    async def connect(cls, path: str=None, host: str="127.0.0.1", port: int=7420):
+        """
+            Connects to a server on a Unix socket (if path is given) or over TCP, see Client
+        """
+        import asyncio
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.close()
+
+    async def close(self):
+        self.writer.close()
+        self.__receiver.cancel()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def request(self, op: str, grammar: str, tokens=None) -> dict:
+        """
+            Sends a request and returns the response of the server as it is, see Client.request
+        """
+        import asyncio
+        id = next(self.__ids)
+        request = {"id":id, "op":op, "grammar":grammar}
+        if tokens is not None:
+            request["tokens"] = list(tokens)
+        future = self.__pending[id] = asyncio.get_running_loop().create_future()
+        self.writer.write(encodeMessage(request))
+        await self.writer.drain()
+        return await future
+
+    async def parse(self, grammar: str, tokens) -> list:
+        """
+            See Client.parse
+        """
+        return _result(await self.request(PARSE, grammar, tokens))["derivation"]
+
+    async def validate(self, grammar: str, tokens) -> "AcceptResult":
+        """
+            See Client.validate
+        """
+        return _acceptResult(_result(await self.request(VALIDATE, grammar, tokens)))
+
+    async def rules(self, grammar: str) -> list:
+        """
+            See Client.rules
+        """
+        return _rules(_result(await self.request(RULES, grammar)))
+
+    async def __receive(self):
+        error = ConnectionError("The server closed the connection")
+        try:
+            while True:
+                response = await readMessage(self.reader)
+                if response is None:
+                    break
+                future = self.__pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ValueError, EOFError, ConnectionError) as e:
+            error = e
+        for future in self.__pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.__pending.clear()
+
+def _result(response):
+    if response.get("ok"):
+        return response
+    error = response.get("error", {})
+    message = error.get("message", "")
+    cls = getattr(lle, error.get("type", ""), None)
+    if isinstance(cls, type) and issubclass(cls, lle.ParsingException):
+        #the message already carries the code and prefix, the state is restored like when unpickling
+        raise cls.restore((message,), {"msg":message, "errCode":error.get("code"), "position":error.get("position")})
+    if error.get("type") == "ValueError":
+        raise ValueError(message)
+    raise RuntimeError(f"{error.get('type')}: {message}")
+
+def _acceptResult(response):
+    from llgram.parsing import AcceptResult
+    if response["accepted"]:
+        return AcceptResult()
+    return AcceptResult(response["position"], frozenset(response["expected"]))
+
+def _rules(response):
+    rules = []
+    for left, right in response["rules"]:
+        rule = Rule()
+        rule.setLeft(left)
+        for symbol in right:
+            rule.appendRight(symbol)
+        rules.append(rule)
+    return rules
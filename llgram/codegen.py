@@ -0,0 +1,241 @@
+from llgram.compiled import CompiledTable
+
+TABLE_STYLE = "table"
+RECURSIVE_STYLE = "recursive"
+
+_HEADER = '''"""
+    Parser generated by llgram for the grammar with the start symbol {start!r}.
+    Do not edit, regenerate it with llgram.codegen instead.
+
+    parse(input) returns the leftmost derivation as a list of rules, parseRuleIds(input) returns the indexes of the rules in RULES.
+"""
+from llgram import llexceptions as lle
+from llgram.rule import Rule
+
+def _rule(left, right):
+    rule = Rule()
+    rule.setLeft(left)
+    for symbol in right:
+        rule.appendRight(symbol)
+    return rule
+
+START_SYMBOL = {start!r}
+SYMBOLS = {symbols!r}
+TERMINALS = {terminals!r}
+RULES = [_rule(left, right) for left, right in {rules!r}]
+
+def parse(input) -> list:
+    """
+        Parses the input and returns the leftmost derivation.
+
+        Raises
+        ------
+        ParsingLexicalException
+            If the input contains an unknown terminal
+
+        ParsingSyntaxException
+            If the input is not a sentence of the grammar
+    """
+    rules = RULES
+    return [rules[i] for i in parseRuleIds(input)]
+'''
+
+_TABLE_PARSER = '''
+TERMINAL_COUNT = {terminalCount!r}
+START = {startId!r}
+END = {endId!r}
+RIGHT = {right!r}
+#rule of the cell [nonterminal, terminal] under the key nonterminal * TERMINAL_COUNT + terminal
+ACTIONS = {actions!r}
+
+def parseRuleIds(input) -> list:
+    """
+        Parses the input and returns the leftmost derivation as indexes of RULES.
+    """
+    actions = ACTIONS
+    right = RIGHT
+    terminalIds = TERMINALS
+    terminalCount = TERMINAL_COUNT
+
+    stack = [START]
+    derivation = []
+    derive = derivation.append
+    push = stack.extend
+    pop = stack.pop
+
+    position = 0
+    for token in input:
+        terminal = terminalIds.get(token)
+        if terminal is None:
+            raise lle.ParsingLexicalException.unknown(token, position)
+        while True:
+            if not stack:
+                raise lle.ParsingSyntaxException.afterEnd(token, position)
+            top = pop()
+            if top == terminal:
+                break
+            if top < terminalCount:
+                raise lle.ParsingSyntaxException.expected(SYMBOLS[top], token, position)
+            rule = actions.get(top * terminalCount + terminal)
+            if rule is None:
+                raise lle.ParsingSyntaxException.noRule(SYMBOLS[top], token, position)
+            push(right[rule])
+            derive(rule)
+        position += 1
+
+    while stack:
+        top = pop()
+        if top < terminalCount:
+            raise lle.ParsingSyntaxException.expected(SYMBOLS[top], None, position)
+        rule = actions.get(top * terminalCount + END)
+        if rule is None:
+            raise lle.ParsingSyntaxException.noRule(SYMBOLS[top], None, position)
+        push(right[rule])
+        derive(rule)
+
+    return derivation
+'''
+
+_RECURSIVE_PARSER = '''
+END = {endId!r}
+
+class _Input:
+    __slots__ = ("tokens", "token", "terminal", "position")
+
+    def __init__(self, input):
+        self.tokens = iter(input)
+        self.position = -1
+        self.advance()
+
+    def advance(self):
+        self.position += 1
+        for token in self.tokens:
+            terminal = TERMINALS.get(token)
+            if terminal is None:
+                raise lle.ParsingLexicalException.unknown(token, self.position)
+            self.token = token
+            self.terminal = terminal
+            return
+        self.token = None
+        self.terminal = END
+
+    def expect(self, terminal):
+        if self.terminal != terminal:
+            if self.terminal == END:
+                raise lle.ParsingSyntaxException.expected(SYMBOLS[terminal], None, self.position)
+            raise lle.ParsingSyntaxException.expected(SYMBOLS[terminal], self.token, self.position)
+        self.advance()
+
+    def noRule(self, nonterminal):
+        if self.terminal == END:
+            raise lle.ParsingSyntaxException.noRule(nonterminal, None, self.position)
+        raise lle.ParsingSyntaxException.noRule(nonterminal, self.token, self.position)
+
+def parseRuleIds(input) -> list:
+    """
+        Parses the input and returns the leftmost derivation as indexes of RULES.
+    """
+    stream = _Input(input)
+    derivation = []
+    {start}(stream, derivation.append)
+    if stream.terminal != END:
+        raise lle.ParsingSyntaxException.afterEnd(stream.token, stream.position)
+    return derivation
+'''
+
+def generateParser(table, style: str=TABLE_STYLE) -> str:
+    """
+        Generates the source of a standalone python module parsing the grammar of the table.
+
+        The module only depends on llgram.rule and llgram.llexceptions, it exposes parse(input) with the same contract as LLParser.parse
+        (leftmost derivation as a list of rules) and parseRuleIds(input) returning indexes of the module level RULES list.
+
+        Parameters
+        ----------
+        table: CompiledTable or TableGenerator
+            Table to generate the parser for
+
+        style: str
+            TABLE_STYLE ("table") for a table driven parser with the table as literal constants,
+            RECURSIVE_STYLE ("recursive") for a recursive descent parser with one function per nonterminal.
+            The recursive parser loops instead of recursing when a rule ends with its own nonterminal,
+            other deep nesting is limited by the python recursion limit.
+
+        Returns
+        -------
+        str
+            Source of the module
+    """
+    compiled = CompiledTable.fromGenerator(table, lazy=False)
+
+    source = _HEADER.format(
+        start=compiled.startSymbol,
+        symbols=tuple(compiled.symbols),
+        terminals=compiled.inputIds,
+        rules=tuple((rule.getLeft(), tuple(rule.getRight())) for rule in compiled.rules),
+    )
+
+    if style == TABLE_STYLE:
+        return source + _tableParser(compiled)
+    elif style == RECURSIVE_STYLE:
+        return source + _recursiveParser(compiled)
+    raise ValueError(f"Unknown parser style \"{style}\"")
+
+def writeParser(table, fout, style: str=TABLE_STYLE):
+    """
+        Writes the source generated by generateParser to a text file open for writing.
+    """
+    fout.write(generateParser(table, style))
+
+def _cells(compiled, symbolId):
+    #nonempty cells of the row of a nonterminal as (terminal ID, rule ID) pairs
+    return compiled.row(symbolId).items()
+
+def _tableParser(compiled):
+    terminalCount = compiled.terminalCount
+    actions = {}
+    for symbolId in range(terminalCount, len(compiled.symbols)):
+        for terminal, rule in _cells(compiled, symbolId):
+            actions[symbolId * terminalCount + terminal] = rule
+
+    return _TABLE_PARSER.format(
+        terminalCount=terminalCount,
+        startId=compiled.startId,
+        endId=compiled.endId,
+        right=compiled.ruleRight,
+        actions=actions,
+    )
+
+def _recursiveParser(compiled):
+    names = {symbolId:f"_parse{symbolId - compiled.terminalCount}" for symbolId in range(compiled.terminalCount, len(compiled.symbols))}
+    lines = [_RECURSIVE_PARSER.format(endId=compiled.endId, start=names[compiled.startId])]
+
+    for symbolId, name in names.items():
+        #group the lookahead terminals by the rule they select
+        branches = {}
+        for terminal, rule in _cells(compiled, symbolId):
+            branches.setdefault(rule, []).append(terminal)
+
+        lines.append(f"def {name}(stream, derive):")
+        lines.append(f"    #{compiled.symbols[symbolId]}")
+        lines.append("    while True:")
+        lines.append("        terminal = stream.terminal")
+        keyword = "if"
+        for rule, terminals in branches.items():
+            condition = f"terminal == {terminals[0]}" if len(terminals) == 1 else f"terminal in {set(terminals)!r}"
+            lines.append(f"        {keyword} {condition}:")
+            lines.append(f"            #{compiled.rules[rule]}")
+            lines.append(f"            derive({rule})")
+            right = compiled.ruleRight[rule][::-1]
+            tail = len(right) > 0 and right[-1] == symbolId
+            for symbol in (right[:-1] if tail else right):
+                if symbol < compiled.terminalCount:
+                    lines.append(f"            stream.expect({symbol})")
+                else:
+                    lines.append(f"            {names[symbol]}(stream, derive)")
+            lines.append("            continue" if tail else "            return")
+            keyword = "elif"
+        lines.append(f"        stream.noRule({compiled.symbols[symbolId]!r})")
+        lines.append("")
+
+    return "\n".join(lines)
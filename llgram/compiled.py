@@ -0,0 +1,400 @@
+from array import array
+
+from llgram import constants as const
+from llgram.rule import Rule
+
+NO_RULE = -1 #marks an empty cell of the action table
+
+class CompiledTable:
+    def __init__(self, terminals: list, nonterminals: list, rules: list, startSymbol: str, actions, rowBase=None):
+        """
+            Interned form of an LL(1) parsing table.
+
+            Every symbol has an integer ID. Terminals occupy IDs 0..len(terminals)-1 (the end symbol is always 0),
+            nonterminals follow them. Every rule has an integer ID and its right hand side is stored as a tuple of symbol IDs
+            in reversed order (epsilon removed), so it can be pushed onto the parsing stack directly.
+
+            The cell [nonterminal, terminal] is actions[rowBase[nonterminal ID] + terminal ID]. In a dense table the rows
+            are stored one after another. In a compressed table (see compress) the rows are packed into each other
+            (row displacement), so a cell may hold a rule of another row. A rule belongs to the cell only if it rewrites
+            the nonterminal of the row, ruleCheck[rule] == nonterminal ID, this check also rejects NO_RULE.
+
+            A table compiled from a lazy generator (see fromGenerator) starts with all rows at one shared empty row,
+            it counts as compressed. A row is loaded from the generator (and appended to the actions) the first time
+            a lookup finds no rule in it, parsers call fill for that.
+
+            Parameters
+            ----------
+            terminals: list
+                Terminal symbols, the index in the list is the terminal ID
+
+            nonterminals: list
+                Nonterminal symbols, the ID of a nonterminal is len(terminals) + its index in the list
+
+            rules: list
+                Rules referenced by the table, the index in the list is the rule ID
+
+            startSymbol: str
+                Starting symbol of the grammar
+
+            actions: array
+                Dense action table of len(nonterminals) * len(terminals) rule IDs in row-major order, NO_RULE marks an empty cell.
+                Any sequence of ints supporting indexing works, e.g. a memoryview of a memory mapped file.
+                For a compressed table, the packed rows.
+
+            rowBase: list
+                Offsets of the rows of the nonterminals (in the order of nonterminals) in a compressed table, None for a dense table
+        """
+        self.terminals = terminals
+        self.nonterminals = nonterminals
+        self.symbols = terminals + nonterminals
+        self.rules = rules
+        self.startSymbol = startSymbol
+        self.actions = actions
+        self.path = None #file the table is memory mapped from, see llgram.serialization.loadBinary
+        self.pending = set() #IDs of the nonterminals whose rows were not loaded yet, see fromGenerator
+        self.rowLoader = None #function returning the row of a nonterminal as {terminal:rule}, for the pending rows
+        self.macros = {} #nonterminal ID * terminal count + terminal ID:macro step, see macro
+
+        self.terminalCount = len(terminals)
+        self.terminalIds = {terminal:i for i, terminal in enumerate(terminals)}
+        #terminals that can appear in the input, the end symbol only stands for the end of input
+        self.inputIds = {terminal:i for terminal, i in self.terminalIds.items() if terminal != const.END_SYMBOL}
+        self.symbolIds = {symbol:i for i, symbol in enumerate(self.symbols)}
+        self.ruleIds = {rule:i for i, rule in enumerate(rules)}
+
+        #offset of the row of each nonterminal in the action table, indexed by symbol ID
+        self.compressed = rowBase is not None
+        if rowBase is None:
+            rowBase = range(0, len(nonterminals) * self.terminalCount, self.terminalCount)
+        elif min(rowBase, default=0) < 0:
+            #a negative offset would wrap around the actions and read cells of other rows
+            raise ValueError("Row offsets of a compressed table can't be negative")
+        self.rowBase = [0] * self.terminalCount + list(rowBase)
+
+        self.ruleLeft = array('i', (self.symbolIds[rule.getLeft()] for rule in rules))
+        #owner of the cells holding each rule, the extra item at index NO_RULE matches no nonterminal
+        self.ruleCheck = array('i', self.ruleLeft)
+        self.ruleCheck.append(NO_RULE)
+        self.ruleRight = tuple(tuple(self.symbolIds[symbol] for symbol in reversed(rule.getRight()) if symbol != const.EPSILON_SYMBOL) for rule in rules)
+        self.ruleArity = array('i', (len(right) for right in self.ruleRight))
+
+        self.startId = self.symbolIds[startSymbol]
+        self.endId = self.terminalIds[const.END_SYMBOL]
+
+    def __reduce_ex__(self, protocol):
+        #a memory mapped table is shipped as its path, the receiving process maps the same file
+        if self.path is not None:
+            return (_loadMapped, (self.path,))
+        return super().__reduce_ex__(protocol)
+
+    def __getstate__(self):
+        #rule actions are arbitrary callables, only the grammar part of the rules is shipped when pickling
+        self.complete()
+        state = self.__dict__.copy()
+        state["rowLoader"] = None
+        state["rules"] = [_strippedRule(rule) for rule in self.rules]
+        state["ruleIds"] = None
+        state["macros"] = {}
+        if isinstance(self.actions, memoryview):
+            state["actions"] = array('i', self.actions)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.ruleIds = {rule:i for i, rule in enumerate(self.rules)}
+
+    @classmethod
+    def fromTable(cls, parsingTable: dict, startSymbol: str, compress: bool=False):
+        """
+            Compiles a parsing table (such as one generated by llgram.generation.TableGenerator) into the interned form.
+
+            Parameters
+            ----------
+            parsingTable: dict
+                Parsing table as a nonterminal:{terminal:rule} dictionary, cells may be missing or None
+
+            startSymbol: str
+                Starting symbol of the grammar
+
+            compress: bool
+                If true, the rows are packed into a compressed table (see compress) without building the dense one
+
+            Returns
+            -------
+            CompiledTable
+                The compiled table
+        """
+        nonterminals = list(parsingTable.keys())
+        terminals = {const.END_SYMBOL:None}
+        rules = {}
+
+        for row in parsingTable.values():
+            for terminal, rule in row.items():
+                terminals[terminal] = None
+                if rule is not None:
+                    rules[rule] = None
+
+        #terminals which only ever get matched are not columns of the table
+        for rule in rules:
+            for symbol in rule.getRight():
+                if symbol not in parsingTable and symbol != const.EPSILON_SYMBOL:
+                    terminals[symbol] = None
+        if startSymbol not in parsingTable:
+            terminals[startSymbol] = None
+
+        terminals = list(terminals)
+        terminalIds = {terminal:i for i, terminal in enumerate(terminals)}
+        rules = list(rules)
+        ruleIds = {rule:i for i, rule in enumerate(rules)}
+
+        rows = [{terminalIds[terminal]:ruleIds[rule] for terminal, rule in row.items() if rule is not None} for row in parsingTable.values()]
+        return cls.fromRows(terminals, nonterminals, rules, startSymbol, rows, compress)
+
+    @classmethod
+    def fromRows(cls, terminals: list, nonterminals: list, rules: list, startSymbol: str, rows: list, compress: bool=False):
+        """
+            Creates a table from its rows, see CompiledTable for the parameters.
+
+            Parameters
+            ----------
+            rows: list
+                Nonempty cells of the row of every nonterminal (in the order of nonterminals) as {terminal ID:rule ID} dictionaries
+
+            compress: bool
+                If true, the rows are packed into a compressed table (see compress)
+        """
+        if compress:
+            actions, rowBase = _pack(rows, len(terminals))
+            return cls(terminals, nonterminals, rules, startSymbol, actions, rowBase)
+
+        actions = array('i', [NO_RULE]) * (len(nonterminals) * len(terminals))
+        for i, row in enumerate(rows):
+            base = i * len(terminals)
+            for terminal, rule in row.items():
+                actions[base + terminal] = rule
+        return cls(terminals, nonterminals, rules, startSymbol, actions)
+
+    @classmethod
+    def fromGenerator(cls, generator, compress: bool=False, lazy: bool=True):
+        """
+            Compiles the table of a llgram.generation.TableGenerator. A CompiledTable is returned unchanged,
+            or compressed if compress is true.
+
+            The table of a lazy generator (unless compressed, or lazy is false) is compiled without computing any row,
+            the rows are computed by the generator when a parser first looks them up. All terminals and rules of the grammar
+            are numbered up front. Otherwise the generator computes its whole table first. The numbering is that of the grammar
+            at compile time, so once the generator is edited the remaining rows can't be loaded (RuntimeError), call complete before editing.
+        """
+        if isinstance(generator, CompiledTable):
+            return generator.compress() if compress and not generator.compressed else generator
+        if generator.isLazy() and lazy and not compress:
+            return cls.__fromLazyGenerator(generator)
+        return cls.fromTable(generator.getParsingTable(), generator.getStartSymbol(), compress)
+
+    @classmethod
+    def __fromLazyGenerator(cls, generator):
+        startSymbol = generator.getStartSymbol()
+        nonterminals = list(generator.getRulesByLeft())
+        terminals = [const.END_SYMBOL] + sorted(generator.getTerminals() - {const.EPSILON_SYMBOL, const.END_SYMBOL})
+        if startSymbol not in generator.getRulesByLeft() and startSymbol not in terminals:
+            terminals.append(startSymbol)
+        rules = list(dict.fromkeys(generator.getRules()))
+
+        #every row starts as one shared empty row, a loaded row is appended to the actions (see __loadRow)
+        actions = array('i', [NO_RULE]) * len(terminals)
+        compiled = cls(terminals, nonterminals, rules, startSymbol, actions, [0] * len(nonterminals))
+        compiled.pending = set(range(compiled.terminalCount, len(compiled.symbols)))
+        version = generator.getVersion()
+
+        def loadRow(nonterminal):
+            #symbols and rules are numbered for the grammar at compile time, rows of an edited grammar don't fit them
+            if generator.getVersion() != version:
+                raise RuntimeError(f"The grammar was edited after its lazy table was compiled, the row of \"{nonterminal}\" can't be loaded. Compile the table again, or call complete before editing.")
+            return generator.getRow(nonterminal)
+
+        compiled.rowLoader = loadRow
+        return compiled
+
+    def compress(self):
+        """
+            Returns a compressed copy of the table. The rows are packed into one array by row displacement: every row is placed
+            at the lowest offset where its nonempty cells only fall on empty cells of the rows placed before it
+            (the densest rows are placed first). Lookups stay O(1), see CompiledTable.
+
+            A table with few nonempty cells per row, e.g. one with thousands of terminals, shrinks to a small fraction
+            of the dense table, see compressionRatio.
+
+            Returns
+            -------
+            CompiledTable
+                The compressed table
+        """
+        rows = [self.row(symbolId) for symbolId in range(self.terminalCount, len(self.symbols))]
+        return CompiledTable.fromRows(self.terminals, self.nonterminals, self.rules, self.startSymbol, rows, True)
+
+    def compressionRatio(self) -> float:
+        """
+            Returns the number of cells of the dense table divided by the number of cells stored, 1.0 for a dense table.
+        """
+        return len(self.nonterminals) * self.terminalCount / len(self.actions) if len(self.actions) else 1.0
+
+    def isTerminal(self, symbolId: int) -> bool:
+        return symbolId < self.terminalCount
+
+    def lookup(self, nonterminalId: int, terminalId: int) -> int:
+        """
+            Returns the ID of the rule in the cell [nonterminal, terminal] or NO_RULE if the cell is empty.
+        """
+        rule = self.actions[self.rowBase[nonterminalId] + terminalId]
+        return rule if self.ruleCheck[rule] == nonterminalId else self.fill(nonterminalId, terminalId)
+
+    def fill(self, nonterminalId: int, terminalId: int) -> int:
+        """
+            Looks up a cell again after a lookup found no rule of the nonterminal in it. If the row of the nonterminal
+            was not loaded yet (lazy tables only), it is loaded first.
+
+            Returns
+            -------
+            int
+                Rule ID of the cell or NO_RULE
+        """
+        if nonterminalId in self.pending:
+            self.__loadRow(nonterminalId)
+            return self.lookup(nonterminalId, terminalId)
+        return NO_RULE
+
+    def complete(self):
+        """
+            Loads all rows that were not loaded yet, see fill.
+        """
+        for nonterminalId in sorted(self.pending):
+            self.__loadRow(nonterminalId)
+
+    def __loadRow(self, nonterminalId):
+        row = self.rowLoader(self.symbols[nonterminalId])
+        base = self.rowBase[nonterminalId] = len(self.actions)
+        self.actions.extend([NO_RULE] * self.terminalCount)
+        for terminal, rule in row.items():
+            self.actions[base + self.terminalIds[terminal]] = self.ruleIds[rule]
+        self.pending.discard(nonterminalId)
+
+    def row(self, nonterminalId: int) -> dict:
+        """
+            Returns the nonempty cells of the row of a nonterminal as a {terminal ID:rule ID} dictionary.
+        """
+        if nonterminalId in self.pending:
+            self.__loadRow(nonterminalId)
+        actions = self.actions
+        check = self.ruleCheck
+        base = self.rowBase[nonterminalId]
+        result = {}
+        for terminal in range(self.terminalCount):
+            rule = actions[base + terminal]
+            if check[rule] == nonterminalId:
+                result[terminal] = rule
+        return result
+
+    def macro(self, nonterminalId: int, terminalId: int):
+        """
+            Returns the macro step of a nonterminal on a terminal: all expansions the parser makes with the nonterminal
+            on top of the stack and the terminal as lookahead, down to the point where the terminal is matched,
+            so that the parser can apply a chain like E -> T E2, T -> F T2, F -> id in one step. The expansion stops early
+            at a symbol the terminal can't be derived from (the parser then reports the error as it would without the macro),
+            when all symbols pushed are derived to an empty string, or at a nonterminal that was already expanded (a cycle).
+
+            Macros are computed on first use and memoized in self.macros under nonterminalId * terminalCount + terminalId.
+
+            Returns
+            -------
+            tuple
+                (symbols left on the stack in stack order, rule IDs of the expansions, True if the terminal was matched
+                and removed from the stack), None if the cell is empty
+        """
+        terminalCount = self.terminalCount
+        right = self.ruleRight
+        stack = [nonterminalId]
+        rules = []
+        expanded = set()
+        while stack:
+            symbolId = stack[-1]
+            if symbolId < terminalCount or symbolId in expanded:
+                break
+            rule = self.lookup(symbolId, terminalId)
+            if rule == NO_RULE:
+                if not rules:
+                    return None
+                break
+            expanded.add(symbolId)
+            stack.pop()
+            stack.extend(right[rule])
+            rules.append(rule)
+
+        matched = bool(stack) and stack[-1] == terminalId
+        if matched:
+            stack.pop()
+        macro = self.macros[nonterminalId * terminalCount + terminalId] = (tuple(stack), tuple(rules), matched)
+        return macro
+
+    def getRules(self, ruleIds) -> list:
+        """
+            Translates a sequence of rule IDs back to a list of Rule objects.
+        """
+        rules = self.rules
+        return [rules[i] for i in ruleIds]
+
+def _pack(rows, width):
+    #row displacement packing of the rows of a table with width columns, returns the packed cells and the offset of every row
+    rowBase = [0] * len(rows)
+    used = bytearray()
+    free = 0 #all cells before this one are used
+
+    for i in sorted(range(len(rows)), key=lambda i: -len(rows[i])):
+        row = rows[i]
+        if not row:
+            continue
+        columns = sorted(row)
+        first = columns[0]
+        rest = columns[1:]
+        #only offsets putting the first cell on an empty cell are tried
+        position = max(free, first)
+        while True:
+            found = used.find(0, position)
+            #past the used cells any position is free, but not one before first (that would give a negative offset)
+            position = found if found >= 0 else max(position, len(used))
+            base = position - first
+            end = base + columns[-1] + 1
+            if end > len(used):
+                used.extend(bytes(end - len(used)))
+            for column in rest:
+                if used[base + column]:
+                    break
+            else:
+                break
+            position += 1
+        for column in columns:
+            used[base + column] = 1
+        rowBase[i] = base
+        free = used.find(0, free)
+        if free < 0:
+            free = len(used)
+
+    #every row is followed by at least width cells, so lookups of any terminal stay in the array
+    actions = array('i', [NO_RULE]) * (max(rowBase, default=0) + width)
+    for i, row in enumerate(rows):
+        base = rowBase[i]
+        for column, rule in row.items():
+            actions[base + column] = rule
+    return actions, rowBase
+
+def _strippedRule(rule):
+    result = Rule()
+    result.setLeft(rule.getLeft())
+    for symbol in rule.getRight():
+        result.appendRight(symbol)
+    result.setFirst(rule.getFirst())
+    return result
+
+def _loadMapped(path):
+    from llgram.serialization import loadBinary
+    return loadBinary(path)
@@ -1,24 +1,45 @@
-import re
-import logging
+import os
+import sys
 import json
+import multiprocessing
+from contextlib import nullcontext
 
 from llgram import llexceptions as lle
 from llgram import constants as const
 from llgram.rule import Rule
-
-logger = logging.getLogger('simple')
-logger.setLevel(logging.CRITICAL)
+from llgram.analysis import GrammarAnalysis
 
 class TableGenerator:
-    def __init__(self, grammar):
+    def __init__(self, grammar, bitsets: bool=False, stats=None, workers: int=None, lazy: bool=False):
         """
             This object reads a grammar in the argument grammar and creates a parsing table.
             If the provided grammar isn't LL(1) grammar, an exception is thrown.
 
             Parameters
             ----------
-            fin : str
-                string containing an input grammar in a compatible format.
+            grammar : str or file
+                string containing an input grammar in a compatible format, or a text file object it is read from line by line (see fromFile).
+
+            bitsets : bool
+                If true, first and follow sets are computed as int bitmasks over the numbered terminals instead of python sets.
+                The getters still return python sets unless asked for bitmasks.
+
+            stats : Stats
+                If given, the time of every phase ("lexing", "emptySets", "firstSets", "ruleFirstSets", "followSets", "table", "update" for edits)
+                and the iterations of the analyses are recorded in it (see llgram.stats.Stats)
+
+            workers : int
+                If more than 1, the first sets of the rules and the table rows are computed by this many worker processes
+                once the empty, first and follow sets of the symbols are final, the time of both is recorded as the "table" phase.
+                The workers are forked, so they share the sets with this process and build the rows in the same order,
+                the table and the conflicts are exactly the same as without workers.
+                Where processes can't be forked, the table is computed in this process.
+
+            lazy : bool
+                If true, the constructor only reads and indexes the rules. The sets and table rows are computed when first needed,
+                by getRow, warm, a parser of a lazy compiled table (see llgram.compiled.CompiledTable.fromGenerator) looking up a row,
+                or by a getter returning all of them, and only for the part of the grammar they depend on.
+                An LL(1) conflict is then raised when the conflicting row is computed. Edits compute everything first.
 
             Raises
             ------
@@ -26,16 +47,96 @@ class TableGenerator:
                 If the provided grammar is not LL(1)
         """
         lexer = Lexer()
+        self.stats = stats
 
         #constants.__EPSILON_SYMBOL = "epsilon" #epsilon constant
         #const.END_SYMBOL = "__$"
 
-        self.__terminals = set()
-        self.__nonterminals = set()
-        self.__rules, self.__startSymbol = lexer.scanRules(grammar)
+        with self.__phase("lexing"):
+            if isinstance(grammar, str):
+                self.__rules, self.__startSymbol = lexer.scanRules(grammar)
+            else:
+                self.__rules, self.__startSymbol = lexer.scanFile(grammar)
+        self.__bitsets = bitsets
+        self.__workers = workers
+        self.__lazy = lazy
+        self.__conflicts = {} #nonterminal:[conflicts in its row], only kept after an edit
+        self.__version = 0 #number of edits, see getVersion
 
         self.__table = None
 
+        if lazy:
+            self.__prepare()
+            self.__analysis.computeTerminalSets()
+            self.__table = {}
+        else:
+            self.__build()
+
+    @classmethod
+    def fromFile(cls, source, bitsets: bool=False, stats=None, workers: int=None, lazy: bool=False):
+        """
+            Creates a generator from a grammar file. The file is read line by line, so the grammar is never held in memory
+            as a single string.
+
+            Parameters
+            ----------
+            source : str or file
+                Path to the grammar file, or a text file object
+
+            bitsets, stats, workers, lazy
+                See TableGenerator
+
+            Returns
+            -------
+            TableGenerator
+                Generator of the grammar in the file
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as fin:
+                return cls(fin, bitsets, stats, workers, lazy)
+        return cls(source, bitsets, stats, workers, lazy)
+
+    def __build(self, conflicts=None):
+        """
+            Computes all sets and the table of the current rules. Conflicts are collected in conflicts, or raised if it is None.
+        """
+        self.__prepare()
+        self.__lazy = False
+
+        #compute empty sets
+        with self.__phase("emptySets"):
+            iterations = self.__analysis.computeEmptySets()
+        self.__count("emptyIterations", iterations)
+
+        #compute first sets. They are stored in the rules themeselves
+        with self.__phase("firstSets"):
+            components = self.__analysis.computeFirstSets()
+        self.__count("firstComponents", components)
+
+        #compute follow sets
+        with self.__phase("followSets"):
+            components = self.__analysis.computeFollowSets()
+        self.__count("followComponents", components)
+
+        if self.__workers is not None and self.__workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            with self.__phase("table"):
+                self.__computeParsingTableInWorkers(conflicts)
+            return
+
+        with self.__phase("ruleFirstSets"):
+            self.__computeRuleFirstSets()
+
+        #compute the table
+        with self.__phase("table"):
+            self.__computeParsingTable(conflicts)
+
+    def __prepare(self):
+        """
+            Finds the terminals and nonterminals and indexes the rules, no sets are computed
+        """
+        self.__terminals = set()
+        self.__nonterminals = set()
+
         #find the terminal and nonterminal sets
         #find the nonterminals (symbols on the left)
         for rule in self.__rules:
@@ -47,22 +148,93 @@ class TableGenerator:
                 if symbol not in self.__nonterminals:
                     self.__terminals.add(symbol)
 
-        self.__followSets = {nonterminal:set() for nonterminal in self.__nonterminals}
-        self.__emptySets = {symbol:False for symbol in self.__nonterminals.union(self.__terminals)} #False if empty, True if it would contain epsilon
-        self.__firstSets = {symbol:set() for symbol in self.__nonterminals.union(self.__terminals)}
+        self.__analysis = GrammarAnalysis(self.__rules, self.__startSymbol, self.__nonterminals, self.__terminals, self.__bitsets)
+        self.__rulesByLeft = self.__analysis.rulesByLeft
 
-        #compute empty sets
-        self.__computeEmptySets()
+    def isLazy(self) -> bool:
+        """
+            Returns True if the sets and table rows are still computed on demand (see the lazy parameter of TableGenerator)
+        """
+        return self.__lazy
 
-        #compute first sets. They are stored in the rules themeselves
-        self.__computeSymbolFirstSets()
-        self.__computeRuleFirstSets()
+    def warm(self, nonterminals=None):
+        """
+            Computes the table rows of the given nonterminals and the sets they depend on ahead of their first use.
+            Without nonterminals, everything is computed and the generator stops being lazy. Does nothing for a generator that isn't lazy.
 
-        #compute follow sets
-        self.__computeFollowSets()
+            Parameters
+            ----------
+            nonterminals: iterable
+                Nonterminals whose rows are computed
 
-        #compute the table
-        self.__computeParsingTable()
+            Raises
+            ------
+            GrammarNotLL1Exception
+                If one of the computed rows has a conflict
+        """
+        if not self.__lazy:
+            return
+        if nonterminals is None:
+            self.__build()
+            return
+        for nonterminal in nonterminals:
+            self.getRow(nonterminal)
+
+    def getRow(self, nonterminal: str) -> dict:
+        """
+            Returns the table row of a nonterminal, computing it (and the sets it needs) first if the generator is lazy.
+
+            Parameters
+            ----------
+            nonterminal: str
+                The nonterminal
+
+            Returns
+            -------
+            dict
+                Sparse row of terminal:rule cells (see getParsingTable)
+
+            Raises
+            ------
+            ValueError
+                If the symbol is not a nonterminal of the grammar
+
+            GrammarNotLL1Exception
+                If the row of a lazy generator is computed and has a conflict
+        """
+        row = self.__table.get(nonterminal)
+        if row is not None:
+            return row
+        if nonterminal not in self.__rulesByLeft:
+            raise ValueError(f"\"{nonterminal}\" is not a nonterminal of the grammar")
+
+        with self.__phase("table"):
+            analysis = self.__analysis
+            rules = self.__rulesByLeft[nonterminal]
+            analysis.ensureFirstSets({symbol for rule in rules for symbol in rule.getRight()})
+            for rule in rules:
+                rule.setFirst(analysis.toSet(analysis.firstOfString(rule.getRight())))
+            if any(const.EPSILON_SYMBOL in rule.getFirst() for rule in rules):
+                analysis.ensureFollowSets((nonterminal,))
+            self.__updateRow(nonterminal, None)
+        return self.__table[nonterminal]
+
+    def __phase(self, name):
+        return self.stats.phase(name) if self.stats is not None else nullcontext()
+
+    def __count(self, name, amount):
+        if self.stats is not None:
+            self.stats.add(name, amount)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_TableGenerator__rulesByLeft"] #shared with the analysis, which rebuilds it
+        state["stats"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__rulesByLeft = self.__analysis.rulesByLeft
 
     def getAlphabet(self) -> set:
         """
@@ -119,38 +291,88 @@ class TableGenerator:
         """
         return self.__rules
 
-    def getRuleFirstSets(self) -> dict:
+    def getRulesByLeft(self) -> dict:
+        """
+            Returns the rules grouped by their left hand side
+
+            Returns
+            -------
+            dict
+                Dictionary with nonterminals as keys and lists of their rules as values
+        """
+        return self.__rulesByLeft
+
+    def getRuleFirstSets(self, asBitsets: bool=False) -> dict:
         """
             Returns first sets of the rules (first sets of the left hand side strings).
 
+            Parameters
+            ----------
+            asBitsets: bool
+                If true, the sets are returned as int bitmasks (see getTerminalBits)
+
             Returns
             -------
             dict
                 Dictionary with the entire rule string as a key and sets of strings representing the symbols in the first set of that rule as value.
         """
+        self.warm()
+        if asBitsets:
+            return {rule:self.__analysis.bitsets.fromSet(rule.getFirst()) for rule in self.__rules}
         return {rule:rule.getFirst() for rule in self.__rules}
 
-    def getSymbolFirstSets(self) -> dict:
+    def getSymbolFirstSets(self, asBitsets: bool=False) -> dict:
         """
             Returns first sets for all symbols.
 
+            Parameters
+            ----------
+            asBitsets: bool
+                If true, the sets are returned as int bitmasks (see getTerminalBits)
+
             Returns
             -------
             dict
                 Dictionary with symbols as keys and their first sets as values
         """
-        return self.__firstSets
+        self.warm()
+        return self.__setsView(self.__analysis.firstSets, asBitsets)
 
-    def getFollowSets(self) -> dict:
+    def getFollowSets(self, asBitsets: bool=False) -> dict:
         """
             Returns follow sets for all nonterminals.
 
+            Parameters
+            ----------
+            asBitsets: bool
+                If true, the sets are returned as int bitmasks (see getTerminalBits)
+
             Returns
             -------
             dict
                 Dictionary with nonterminals as keys and their follow sets as values
         """
-        return self.__followSets
+        self.warm()
+        return self.__setsView(self.__analysis.followSets, asBitsets)
+
+    def getTerminalBits(self) -> dict:
+        """
+            Returns the numbering of terminals used by the bitmask representation of first and follow sets.
+
+            Returns
+            -------
+            dict
+                Dictionary with terminals (including epsilon and the end symbol) as keys and the position of their bit as values
+        """
+        return self.__analysis.bitsets.positions
+
+    def __setsView(self, sets, asBitsets):
+        analysis = self.__analysis
+        if asBitsets:
+            return {symbol:analysis.toBitset(value) for symbol, value in sets.items()}
+        if analysis.backend is analysis.bitsets:
+            return {symbol:analysis.toSet(value) for symbol, value in sets.items()}
+        return sets
 
     def getEmptySets(self) -> dict:
         """
@@ -161,117 +383,258 @@ class TableGenerator:
             dict
                 Dictionary with symbols as keys and their empty sets as values
         """
-        return self.__emptySets
+        self.warm()
+        return self.__analysis.emptySets
 
-    def __first(self, symbol):
-        result = set()
-        if symbol in self.__terminals:
-            result.add(symbol)
+    def __computeRuleFirstSets(self):
+        """
+        Requires empty and first sets for symbols to be computed first
+        """
+        for rule in self.__rules:
+            rule.setFirst(self.__analysis.toSet(self.__analysis.firstOfString(rule.getRight())))
+
+    def __computeParsingTable(self, conflicts=None):
+        """
+        Requires first sets of rules and follow sets to be computed first
+        """
+        self.__table = {}
+        self.__conflicts = {}
+        for nonterminal in self.__rulesByLeft:
+            self.__updateRow(nonterminal, conflicts)
+
+    def __computeParsingTableInWorkers(self, conflicts=None):
+        """
+        Computes the first sets of the rules and the table rows in forked worker processes, see TableGenerator.
+        Requires follow sets to be computed first
+        """
+        nonterminals = list(self.__rulesByLeft)
+        size = -(-len(nonterminals) // (self.__workers * 4)) or 1 #a few chunks per worker balance uneven rows
+        chunks = [nonterminals[i:i + size] for i in range(0, len(nonterminals), size)]
+
+        self.__table = {}
+        self.__conflicts = {}
+        context = multiprocessing.get_context("fork")
+        with context.Pool(self.__workers, initializer=_initWorker, initargs=(self,)) as pool:
+            #results arrive in the order of the chunks, so rows and conflicts are assembled in the serial order
+            for chunk, results in zip(chunks, pool.imap(_rowsInWorker, chunks)):
+                for nonterminal, (firsts, cells, rowConflicts) in zip(chunk, results):
+                    rules = self.__rulesByLeft[nonterminal]
+                    for rule, first in zip(rules, firsts):
+                        rule.setFirst(first)
+                    if rowConflicts:
+                        if conflicts is None:
+                            raise rowConflicts[0]
+                        self.__conflicts[nonterminal] = rowConflicts
+                        conflicts.extend(rowConflicts)
+                    self.__table[nonterminal] = {terminal:rules[rule] for terminal, rule in cells}
+
+    def _computeRows(self, nonterminals):
+        """
+        Work of a worker process (see __computeParsingTableInWorkers). For every nonterminal returns the first sets of its rules,
+        the cells of its row as (terminal, index of the rule among the rules of the nonterminal) pairs and the conflicts of the row
+        """
+        results = []
+        for nonterminal in nonterminals:
+            rules = self.__rulesByLeft[nonterminal]
+            for rule in rules:
+                rule.setFirst(self.__analysis.toSet(self.__analysis.firstOfString(rule.getRight())))
+            rowConflicts = []
+            row = self.__computeRow(nonterminal, rowConflicts)
+            index = {id(rule):i for i, rule in enumerate(rules)}
+            results.append(([rule.getFirst() for rule in rules], [(terminal, index[id(rule)]) for terminal, rule in row.items()], rowConflicts))
+        return results
+
+    def __updateRow(self, nonterminal, conflicts):
+        if nonterminal not in self.__rulesByLeft:
+            self.__table.pop(nonterminal, None)
+            self.__conflicts.pop(nonterminal, None)
+            return
+        rowConflicts = [] if conflicts is not None else None
+        self.__table[nonterminal] = self.__computeRow(nonterminal, rowConflicts)
+        if rowConflicts:
+            self.__conflicts[nonterminal] = rowConflicts
+            conflicts.extend(rowConflicts)
         else:
-            for rule in self.__rules:
-                if symbol == rule.getLeft():
-                    result = result.union(self.__first(rule.getRight()[0]))
+            self.__conflicts.pop(nonterminal, None)
+
+    def __computeRow(self, nonterminal, conflicts=None):
+        """
+        Builds a sparse table row (only cells with a rule are present) from the rules of the nonterminal
+        """
+        row = {}
+        follow = None #only needed (and in a lazy generator only computed) if a rule can derive an empty string
+        for rule in self.__rulesByLeft[nonterminal]:
+            first = rule.getFirst()
+            for terminal in first:
+                if terminal != const.EPSILON_SYMBOL:
+                    self.__setCell(row, nonterminal, terminal, rule, conflicts)
+            if const.EPSILON_SYMBOL in first:
+                if follow is None:
+                    follow = self.__analysis.toSet(self.__analysis.followSets[nonterminal])
+                for terminal in follow:
+                    self.__setCell(row, nonterminal, terminal, rule, conflicts)
+        return row
+
+    def __setCell(self, row, nonterminal, terminal, rule, conflicts=None):
+        other = row.get(terminal)
+        if other is not None and other is not rule:
+            conflict = lle.GrammarNotLL1Exception(nonterminal, terminal, other, rule)
+            if conflicts is None:
+                raise conflict
+            conflicts.append(conflict) #the cell keeps the first rule
+            return
+        row[terminal] = rule
+
+    def add_rule(self, rule) -> list:
+        """
+            Adds a rule to the grammar and updates the sets and table rows affected by it.
+
+            Only the empty, first and follow sets which depend on the changed rules are recomputed, as are the table rows using them.
+            If a symbol changes between a terminal and a nonterminal (a rule for a former terminal is added, or the last rule
+            of a nonterminal still used elsewhere is removed), everything is recomputed.
+
+            Unlike the constructor, an edit does not raise on LL(1) conflicts. The conflicting cells keep their first rule,
+            the conflicts are returned and can be listed with getConflicts until they are removed by another edit.
 
-        return result
+            Parameters
+            ----------
+            rule: Rule or str
+                The rule, either a Rule or a string in the grammar syntax ("A -> b C")
 
-    def __firstOfString(self, string):
+            Returns
+            -------
+            list
+                GrammarNotLL1Exception for every conflict in the updated rows
         """
-        requires first and empty sets of all symbols to be computed first
+        self.warm()
+        return self.__edit([self.__toRule(rule)], [])
+
+    def remove_rule(self, rule) -> list:
         """
-        result = set()
-        for symbol in string:
-            if self.__emptySets[symbol]:
-                result = result.union(self.__firstSets[symbol])
-            else:
-                result = result.union(self.__firstSets[symbol])
-                break
-        return result
+            Removes a rule from the grammar and updates the sets and table rows affected by it, see add_rule.
+
+            Parameters
+            ----------
+            rule: Rule or str
+                The rule to remove, rules are compared by their text
 
-    def __computeSymbolFirstSets(self):
-        for symbol in self.__firstSets.keys():
-            self.__firstSets[symbol] = self.__first(symbol)
+            Returns
+            -------
+            list
+                GrammarNotLL1Exception for every conflict in the updated rows
 
-    def __computeRuleFirstSets(self):
+            Raises
+            ------
+            ValueError
+                If the grammar does not contain the rule
         """
-        Requires empty and first sets for symbols to be computed first
+        self.warm()
+        old = self.__findRule(rule)
+        del self.__rules[self.__ruleIndex(old)]
+        return self.__edit([], [old])
+
+    def replace_rule(self, old, new) -> list:
         """
-        for rule in self.__rules:
-            rhs = rule.getRight()
-            result = set()
-            for symbol in rhs:
-                if self.__emptySets[symbol]:
-                    result = result.union(self.__firstSets[symbol])
-                else:
-                    result = result.union(self.__firstSets[symbol])
-                    break
-            rule.setFirst(result)
-
-    def __computeEmptySets(self):
-        changed = True
-        for rule in self.__rules:
-            rhs = rule.getRight()
-            if len(rhs) == 1 and const.EPSILON_SYMBOL in rhs:
-                self.__emptySets[rule.getLeft()] = True
-
-        while changed:
-            changed = False
-            for rule in self.__rules:
-                rhs = rule.getRight()
-                for symbol in rhs:
-                    if not self.__emptySets[symbol]:
-                        break
-                else:
-                    self.__emptySets[rule.getLeft()] = True
-                    changed = True
-
-    def __emptyOfString(self, string):
-        for symbol in string:
-            if not self.__emptySets[symbol]:
-                break
-        else:
-            return True
-        return False
-
-    def __computeFollowSets(self):
-        changed = True
-        self.__followSets[self.__startSymbol].add(const.END_SYMBOL)
-
-        while changed:
-            changed = False
-            for rule in self.__rules:
-                lhs = rule.getLeft()
-                rhs = rule.getRight()
-                logger.debug(f"Computing from rule: {rule}")
-                for i, symbol in enumerate(rhs):
-                    if symbol in self.__nonterminals:
-                        logger.debug(f"  For symbol: {symbol}. Old follow={self.__followSets[symbol]}")
-                        if not(i+1 == len(rhs) or rhs[i+1] == const.EPSILON_SYMBOL):
-                            if self.__followSets[symbol] != self.__followSets[symbol].union(self.__firstOfString(rhs[i+1:]).difference({const.EPSILON_SYMBOL})):
-                                logger.debug(f"    Add First of next ({rhs[i+1]}): {self.__firstOfString(rhs[i+1:])}")
-                                self.__followSets[symbol] = self.__followSets[symbol].union(self.__firstOfString(rhs[i+1:]).difference({const.EPSILON_SYMBOL}))
-                                changed = True
-                        if self.__emptyOfString(rhs[i+1:]): # Symbol is at the end of production (is followed by an epsilon)
-                            logger.debug(f"    Followed by epsilon.")
-                            if self.__followSets[symbol] != self.__followSets[symbol].union(self.__followSets[lhs]):
-                                logger.debug(f"    Add follow of lhs ({lhs}): {self.__followSets[lhs]}")
-                                self.__followSets[symbol] = self.__followSets[symbol].union(self.__followSets[lhs])
-                                changed = True
-                        logger.debug(f"  New follow={self.__followSets[symbol]}")
-
-    def __computeParsingTable(self):
-        self.__table = {nonterminal:{terminal:None for terminal in self.__terminals.difference({const.EPSILON_SYMBOL}).union({const.END_SYMBOL})} for nonterminal in self.__nonterminals}
-
-        for nonterminal in self.__nonterminals:
-            for terminal in self.__terminals.difference({const.EPSILON_SYMBOL}).union({const.END_SYMBOL}):
-                for rule in self.__rules:
-                    if nonterminal == rule.getLeft():
-                        if (terminal in rule.getFirst()) or (const.EPSILON_SYMBOL in rule.getFirst()) and (terminal in self.__followSets[nonterminal]):
-                            if self.__table[nonterminal][terminal] != None:
-                                raise lle.GrammarNotLL1Exception(nonterminal, terminal, self.__table[nonterminal][terminal], rule)
-                            else:
-                                self.__table[nonterminal][terminal] = rule
+            Replaces a rule of the grammar by another one in one update, see add_rule. The new rule takes the place of the old one.
+
+            Parameters
+            ----------
+            old: Rule or str
+                The rule to replace, rules are compared by their text
+
+            new: Rule or str
+                The new rule
+
+            Returns
+            -------
+            list
+                GrammarNotLL1Exception for every conflict in the updated rows
+
+            Raises
+            ------
+            ValueError
+                If the grammar does not contain the old rule
+        """
+        self.warm()
+        old = self.__findRule(old)
+        new = self.__toRule(new)
+        self.__rules[self.__ruleIndex(old)] = new
+        return self.__edit([new], [old], inserted=True)
+
+    def getConflicts(self) -> list:
+        """
+            Returns the LL(1) conflicts left in the table by edits (see add_rule)
+
+            Returns
+            -------
+            list
+                GrammarNotLL1Exception for every conflicting cell
+        """
+        self.warm()
+        return [conflict for conflicts in self.__conflicts.values() for conflict in conflicts]
+
+    def getVersion(self) -> int:
+        """
+            Returns the number of edits made to the grammar (see add_rule), e.g. to tell whether a table compiled earlier
+            still matches the grammar
+
+            Returns
+            -------
+            int
+                Number of edits
+        """
+        return self.__version
+
+    def __edit(self, added, removed, inserted=False):
+        self.__version += 1
+        with self.__phase("update"):
+            return self.__update(added, removed, inserted)
+
+    def __update(self, added, removed, inserted):
+        if not inserted:
+            self.__rules.extend(added)
+
+        conflicts = []
+        update = self.__analysis.update(added, removed)
+        if update is None:
+            self.__build(conflicts)
+            return conflicts
+
+        rules, rows = update
+        for rule in rules:
+            rule.setFirst(self.__analysis.toSet(self.__analysis.firstOfString(rule.getRight())))
+        for nonterminal in rows:
+            self.__updateRow(nonterminal, conflicts)
+        return conflicts
+
+    def __toRule(self, rule):
+        if isinstance(rule, Rule):
+            return rule
+        rules, _ = Lexer().scanRules(rule)
+        if len(rules) != 1:
+            raise ValueError(f"Expected a single rule, got \"{rule}\"")
+        return rules[0]
+
+    def __findRule(self, rule):
+        rule = self.__toRule(rule)
+        for other in self.__rulesByLeft.get(rule.getLeft(), ()):
+            if other == rule:
+                return other
+        raise ValueError(f"The grammar does not contain the rule \"{rule}\"")
+
+    def __ruleIndex(self, rule):
+        return next(i for i, other in enumerate(self.__rules) if other is rule)
 
     def getParsingTable(self):
+        """
+            Returns the parsing table. Rows are sparse, a cell without an applicable rule is not present in its row.
+
+            Returns
+            -------
+            dict
+                Dictionary of nonterminal:{terminal:rule} rows
+        """
+        self.warm()
         return self.__table
 
     def getParsingTableAsJson(self, indent=4):
@@ -288,6 +651,7 @@ class TableGenerator:
             str
                 A json string with the parsing table
         """
+        self.warm()
         return json.dumps(self.__table, default=lambda o:o.__repr__(), indent=indent)
 
     def printParsingTableAsJson(self, fout, indent=4):
@@ -302,39 +666,21 @@ class TableGenerator:
             indent: int
                 indent of the json file, defaults to 4 spaces
         """
+        self.warm()
         json.dump(self.__table, fout, default=lambda o:o.__repr__(), indent=indent)
 
-class Lexer:
-    def __init__(self):
-        pass
+_workerGenerator = None #generator whose table the current worker process computes, see TableGenerator.__computeParsingTableInWorkers
 
-    def __tokenize(self, grammar):
-        """
-            Tokenizes an input grammar
+def _initWorker(generator):
+    global _workerGenerator
+    _workerGenerator = generator
 
-            Parameters
-            ----------
-            grammar : str
-                String containing the grammar to be scanned.
-            
-            Returns
-            -------
-            list
-                List of rules, where each element is a list of tokens
-        """
-        result = list()
-        lines = grammar.splitlines(False)
-
-        for line in lines:
-            line = line.strip()
-
-            #ignore comments
-            if line[0] == "#":
-                continue
+def _rowsInWorker(nonterminals):
+    return _workerGenerator._computeRows(nonterminals)
 
-            result.append(re.split(r"\s+", line))
-
-        return result
+class Lexer:
+    def __init__(self):
+        pass
 
     def scanRules(self, grammar: str):
         """
@@ -345,6 +691,7 @@ class Lexer:
                 Multiple start symbol lines will result in an error. In the absence of an explicit start symbol, the left hand side of the first rule will be considered the start symbol.
 
                 Every other line should have the form "<nonterminal> -> <symbol1> <symbol2> ..."
+                Empty lines and lines starting with "#" are ignored.
 
                 The set of nonterminals is infered as all symbols that appear on the left hand side of at least one rule.
                 The set of terminals is infered as any symbol that is not a nonterminal.
@@ -363,62 +710,86 @@ class Lexer:
 
             Raises
             ------
-            LexicalException
-                If the grammar in the input is not lexicaly correct
-        """
-        lines = self.__tokenize(grammar)
-        result = list()
-
-        state = 0
-
-        curRule = Rule()
-        startSymbol = ""
-        explicitStartSymbol = False
-        firstRuleRead = False
-        readStartSymbol = False
-
-        for lineCounter, line in enumerate(lines): #line counter is for error reporting purposes
-            for token in line:
-                if state == 0: #start of line
-                    if token == "->":
-                        if not explicitStartSymbol:
-                            state = 3
-                        else:
-                            raise lle.LexicalException(lineCounter, "Start symbol can only be defined once.")
-                    elif token == "\n":
-                        #empty line
-                        continue
-                    else:
-                        state = 1
-                        if not firstRuleRead:
-                            startSymbol = token
-                            firstRuleRead = True
-                        curRule.setLeft(token)
-                elif state == 1: # one token (left-hand side) read
-                    if token == "->":
-                        state = 2
-                    else:
-                        raise lle.GrammarLexicalException(lineCounter, "Only one symbol can appear on the left side of a rule.")
-                elif state == 2: #reading right-hand side
-                    if token == "->":
-                        raise lle.GrammarLexicalException(lineCounter, "Unexpected symbol '->'.")
-                    else:
-                        curRule.appendRight(token)
-                elif state == 3: #reading start symbol
-                    if token == "->":
-                        raise lle.GrammarLexicalException(lineCounter, "Unexpected symbol '->'.")
-                    elif token == "\n":
-                        raise lle.GrammarLexicalException(lineCounter, "No start symbol provided.")
-                    else:
-                        startSymbol = token
-                        explicitStartSymbol = True
-                        readStartSymbol = True
-            #EOL
-            if not readStartSymbol:
-                result.append(curRule)
-            curRule = Rule()
-            state = 0
-            readStartSymbol = False
-
-
-        return result, startSymbol
\ No newline at end of file
+            GrammarLexicalException
+                If the grammar in the input is not lexicaly correct, the line number (counted from 1) is part of the message
+        """
+        return self.scanLines(_lines(grammar))
+
+    def scanFile(self, source):
+        """
+            Performs a lexical analysis of a grammar file, see scanRules. The file is read line by line,
+            so it is never held in memory as a whole.
+
+            Parameters
+            ----------
+            source : str or file
+                Path to the grammar file, or a text file object
+
+            Returns
+            -------
+            list
+                List of rules found in the input grammar
+            str
+                Start Symbol
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as fin:
+                return self.scanLines(fin)
+        return self.scanLines(source)
+
+    def scanLines(self, lines):
+        """
+            Performs a lexical analysis of a grammar given as an iterable of lines, see scanRules.
+            Equal symbols are interned, so every symbol is stored once however many rules use it.
+        """
+        rules = list()
+        startSymbol = None
+        intern = sys.intern
+
+        for lineNumber, line in enumerate(lines, 1):
+            tokens = line.split()
+
+            #ignore empty lines and comments
+            if not tokens or tokens[0][0] == "#":
+                continue
+
+            if tokens[0] == "->": #start symbol
+                if startSymbol is not None:
+                    raise lle.GrammarLexicalException(lineNumber, "Start symbol can only be defined once.")
+                if len(tokens) == 1:
+                    raise lle.GrammarLexicalException(lineNumber, "No start symbol provided.")
+                if len(tokens) > 2:
+                    raise lle.GrammarLexicalException(lineNumber, "Only one start symbol can be provided.")
+                if tokens[1] == "->":
+                    raise lle.GrammarLexicalException(lineNumber, "Unexpected symbol '->'.")
+                startSymbol = intern(tokens[1])
+                continue
+
+            if len(tokens) == 1:
+                raise lle.GrammarLexicalException(lineNumber, "Expected '->' after the left side of a rule.")
+            if tokens[1] != "->":
+                raise lle.GrammarLexicalException(lineNumber, "Only one symbol can appear on the left side of a rule.")
+            left = tokens[0]
+            del tokens[:2]
+            if "->" in tokens:
+                raise lle.GrammarLexicalException(lineNumber, "Unexpected symbol '->'.")
+
+            rule = Rule()
+            rule.setLeft(intern(left))
+            rule.setRight(list(map(intern, tokens)))
+            rules.append(rule)
+
+        if startSymbol is None:
+            startSymbol = rules[0].getLeft() if rules else ""
+        return rules, startSymbol
+
+def _lines(text):
+    #lines of a string, without splitting it into a list first
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end < 0:
+            end = length
+        yield text[start:end]
+        start = end + 1
@@ -4,6 +4,22 @@ class LLException(Exception):
         self.msg = f"{errCode} {msgPrefix}: {msg}"
         self.errCode = errCode
 
+   def __reduce__(self):
+        #subclasses have their own constructor signatures, restore the state directly so exceptions survive pickling
+        return (_restore, (self.__class__, self.args, self.__dict__))
+
+   @classmethod
+   def restore(cls, args, state):
+        #rebuilds an exception from its args and attributes (msg, errCode, position...) without calling the constructor,
+        #e.g. one received from llgram.server
+        exception = cls.__new__(cls, *args)
+        exception.args = args
+        exception.__dict__.update(state)
+        return exception
+
+def _restore(cls, args, state):
+    return cls.restore(args, state)
+
 class GrammarException(LLException):
     def __init__(self, errCode, msgPrefix, msg):
         super().__init__(errCode, msgPrefix, msg)
@@ -21,13 +37,37 @@ class GrammarNotLL1Exception(LLException):
         super().__init__(120, f"Provided grammar is not an LL(1) grammar", f'Both "{rule1}" and "{rule2}" can derive "{nonterminal}/{terminal}"')
 
 class ParsingSyntaxException(ParsingException):
-    def __init__(self, msg):
+    def __init__(self, msg, position=None):
         super().__init__(220, f"Syntax errror in input", msg)
+        self.position = position #position of the offending terminal in the input, the input length for the end of input
+
+    #errors of the parsing loops, a token of None stands for the end of input
+
+    @classmethod
+    def expected(cls, terminal, token, position):
+        if token is None:
+            return cls(f"Expected \"{terminal}\", got end of input", position)
+        return cls(f"Expected \"{terminal}\", got \"{token}\" at position {position}", position)
+
+    @classmethod
+    def noRule(cls, nonterminal, token, position):
+        if token is None:
+            return cls(f"Unexpected end of input while deriving \"{nonterminal}\"", position)
+        return cls(f"No rule for \"{nonterminal}\" on \"{token}\" at position {position}", position)
+
+    @classmethod
+    def afterEnd(cls, token, position):
+        return cls(f"Unexpected \"{token}\" at position {position} after the end of the derivation", position)
 
 class ParsingActionMissingException(ParsingException):
     def __init__(self, rule):
         super().__init__(250, f"Missing an action for a rule encountered during derivation", rule)
 
 class ParsingLexicalException(ParsingException):
-    def __init__(self, msg):
-        super().__init__(210, f"Lexical Error in input", msg)
\ No newline at end of file
+    def __init__(self, msg, position=None):
+        super().__init__(210, f"Lexical Error in input", msg)
+        self.position = position #position of the unknown terminal in the input
+
+    @classmethod
+    def unknown(cls, token, position):
+        return cls(f"Terminal \"{token}\" at position {position} is unknown", position)
\ No newline at end of file
@@ -1,30 +1,90 @@
-import re
-from collections import deque
+import os
+import copy
+import multiprocessing
+from array import array
 
 from llgram import llexceptions as lle
 from llgram import constants as const
 from llgram.rule import Rule
+from llgram.compiled import CompiledTable, NO_RULE
+from llgram.tree import ParseTree, NO_NODE
+from llgram.analysis import GrammarAnalysis
+from llgram.generation import TableGenerator
 
 class LLParser:
-    def __init__(self, parsingTable: dict, startingSymbol: str, actions: dict=None):
+    def __init__(self, parsingTable: dict, startingSymbol: str=None, actions: dict=None, followSets: dict=None, stats=None, compress: bool=False, cache=None):
         """
             Parser based on an LL parsing table.
 
             Parameters
             ----------
             parsingTable: dict
-                Parsing table (such as one generated by llgram.generation.TableGenerator)
+                Parsing table (such as one generated by llgram.generation.TableGenerator), an already compiled table (llgram.compiled.CompiledTable),
+                or a TableGenerator. The table of a lazy generator is compiled without computing its rows, see llgram.compiled.CompiledTable.fromGenerator.
 
             startingSymbol: str
-                Starting symbol of the grammar
+                Starting symbol of the grammar, may be omitted for a compiled table or a generator
 
             actions: dict
                 Dictionary of actions (python functions) to be performed when using a rule (Rule:fuct). If the action is None, nothing will happen.
                 This will only be used with the parse method when the execute parameter was set to True, and only if an alternative set isn't provided.
+
+            followSets: dict
+                Follow sets of the nonterminals (see llgram.generation.TableGenerator.getFollowSets), used by parseWithRecovery to resynchronize after an error.
+                If omitted, they are computed from the rules of the table when first needed.
+
+            stats: Stats
+                If given, parsing with parse, parseRuleIds, iterParse and sessions records the parsing time, the number of terminals,
+                table lookups, the largest stack depth and the use of every rule in it (see llgram.stats.Stats).
+                Without it, the uninstrumented parsing loop is used.
+
+            compress: bool
+                If true, the table is compiled into a compressed table (see llgram.compiled.CompiledTable.compress),
+                which is much smaller for tables with many terminals. Lookups stay O(1).
+
+            cache: ParseResultCache
+                If given, parse and parseRuleIds store their results (derivations and errors) in this cache (see llgram.cache.ParseResultCache)
+                and return the stored result when the same input is parsed again. The input is materialized as a tuple.
         """
+        if isinstance(parsingTable, CompiledTable):
+            self.compiled = parsingTable.compress() if compress and not parsingTable.compressed else parsingTable
+            startingSymbol = parsingTable.startSymbol
+        elif isinstance(parsingTable, TableGenerator):
+            self.compiled = CompiledTable.fromGenerator(parsingTable, compress)
+            startingSymbol = self.compiled.startSymbol
+        else:
+            self.compiled = CompiledTable.fromTable(parsingTable, startingSymbol, compress)
         self.table = parsingTable
         self.actions = actions
         self.startingSymbol = startingSymbol
+        self.__dispatch = None #instance actions resolved by rule ID, see parse and evaluate
+        self.followSets = followSets
+        self.stats = stats
+        self.cache = cache
+        self.__synchronizing = None #synchronizing terminal IDs indexed by symbol ID, see parseWithRecovery
+        self.__recognizer = None #symbol dictionaries of accepts, see _recognizer
+
+    @classmethod
+    def from_file(cls, path: str, actions: dict=None):
+        """
+            Creates a parser from a table saved by llgram.serialization (JSON or binary format).
+            Binary tables are memory mapped, so parsers in many processes share one copy of the table.
+
+            Parameters
+            ----------
+            path: str
+                Path to the saved table
+
+            actions: dict
+                Dictionary of actions, see LLParser
+
+            Returns
+            -------
+            LLParser
+                Parser using the loaded table
+        """
+        from llgram import serialization
+        return cls(serialization.load(path), actions=actions)
 
     def parse(self, input: list, execute: bool=False, explicitActions: bool=False, actions: dict=None) -> list:
         """
@@ -51,52 +111,1046 @@ class LLParser:
             list
                 Leftmost derivation
         """
-        string = input.copy()
-        stack = deque()
-        stack.append(self.startingSymbol)
+        ruleIds = self.parseRuleIds(input)
+        derivation = self.compiled.getRules(ruleIds)
+
+        #potentialy execute actions
+        if execute:
+            if explicitActions:
+                dispatch = self.__instanceDispatch() if actions is None else self.resolveActions(actions)
+                for rule in ruleIds:
+                    action = dispatch[rule]
+                    if action:
+                        action()
+            else:
+                for rule in derivation:
+                    rule.getAction()()
+        
+        return derivation
+
+    def resolveActions(self, actions: dict) -> list:
+        """
+            Resolves a dictionary of actions to a list indexed by rule ID, so that actions don't have to be looked up by rule during parsing.
+            Rules without an entry in the dictionary get an action raising ParsingActionMissingException, None actions are replaced by a function returning None.
+
+            Parameters
+            ----------
+            actions: dict
+                Dictionary of actions (Rule:fuct), rule strings (such as "A -> c") work as keys as well
 
-        derivation = list() #leftmost derivation
+            Returns
+            -------
+            list
+                Actions indexed by rule ID
+        """
+        if isinstance(actions, list):
+            return actions
+        dispatch = []
+        for rule in self.compiled.rules:
+            action = actions[rule] if rule in actions else _MissingAction(rule)
+            dispatch.append(_noValue if action is None else action)
+        return dispatch
 
-        while True:
-            #empty
-            if len(string) == 0 or len(stack) == 0:
-                if len(string) == 0 and len(stack) == 0:
+    def __instanceDispatch(self):
+        #instance actions resolved once, see resolveActions
+        if self.__dispatch is None:
+            self.__dispatch = self.resolveActions(self.actions or {})
+        return self.__dispatch
+
+    def evaluate(self, input, actions=None, values=None):
+        """
+            Parses the input and executes semantic actions during parsing, without keeping the derivation.
+
+            Every action receives the values of the symbols on the right hand side of its rule as arguments (nothing for an epsilon rule)
+            and returns the value of its left hand side. The value of a terminal is the corresponding item of values (the terminal itself by default),
+            the value of a nonterminal is the result of the action of the rule it was rewritten with. A None action gives the value None.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of input terminals
+
+            actions: dict or list
+                Dictionary of actions (Rule:fuct) or a list returned by resolveActions. If this is None, instance (default) actions will be used.
+
+            values: iterable
+                Values of the input terminals, passed to the actions in place of the terminals, as many as there are terminals
+
+            Returns
+            -------
+            object
+                Value of the starting symbol
+
+            Raises
+            ------
+            ParsingActionMissingException
+                If a rule without an action is used
+
+            ValueError
+                If values has fewer or more items than the input
+        """
+        dispatch = self.__instanceDispatch() if actions is None else self.resolveActions(actions)
+
+        compiled = self.compiled
+        table = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalIds = compiled.inputIds
+        terminalCount = compiled.terminalCount
+
+        arities = compiled.ruleArity
+
+        #reduce markers (-rule ID - 1) are pushed below the right hand side of the rule, popping one runs the action of the rule
+        stack = [compiled.startId]
+        pop = stack.pop
+        push = stack.append
+        pushRight = stack.extend
+        valueStack = []
+        pushValue = valueStack.append
+
+        position = 0
+        tokenValues = iter(input) if values is None else zip(input, values, strict=True)
+        for item in tokenValues:
+            if values is None:
+                token = value = item
+            else:
+                token, value = item
+            terminal = terminalIds.get(token)
+            if terminal is None:
+                raise lle.ParsingLexicalException.unknown(token, position)
+            while True:
+                if not stack:
+                    raise lle.ParsingSyntaxException.afterEnd(token, position)
+                top = pop()
+                if top == terminal:
+                    pushValue(value)
                     break
+                if top < 0:
+                    rule = -top - 1
+                    arity = arities[rule]
+                    if arity:
+                        children = valueStack[-arity:]
+                        del valueStack[-arity:]
+                        pushValue(dispatch[rule](*children))
+                    else:
+                        pushValue(dispatch[rule]())
+                    continue
+                if top < terminalCount:
+                    raise lle.ParsingSyntaxException.expected(compiled.symbols[top], token, position)
+                rule = table[rowBase[top] + terminal]
+                if check[rule] != top:
+                    rule = fill(top, terminal)
+                    if rule == NO_RULE:
+                        raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], token, position)
+                push(-rule - 1)
+                pushRight(right[rule])
+            position += 1
+
+        end = compiled.endId
+        while stack:
+            top = pop()
+            if top < 0:
+                rule = -top - 1
+                arity = arities[rule]
+                if arity:
+                    children = valueStack[-arity:]
+                    del valueStack[-arity:]
+                    pushValue(dispatch[rule](*children))
                 else:
-                    raise lle.ParsingSyntaxException("")
+                    pushValue(dispatch[rule]())
+                continue
+            if top < terminalCount:
+                raise lle.ParsingSyntaxException.expected(compiled.symbols[top], None, position)
+            rule = table[rowBase[top] + end]
+            if check[rule] != top:
+                rule = fill(top, end)
+                if rule == NO_RULE:
+                    raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], None, position)
+            push(-rule - 1)
+            pushRight(right[rule])
 
-            top = stack.pop()
-            first = string[0]
+        return valueStack[0]
+
+    def parseRuleIds(self, input) -> array:
+        """
+            Parses the input and returns the leftmost derivation as a compact array of rule IDs.
+            The IDs index the rules of the compiled table (self.compiled.rules).
+
+            Parameters
+            ----------
+            input: list
+                List (or any iterable) of input terminals
 
-            if top == first: # symbols match
-                #consume them and carry on
-                string = string[1:] #stack has already been popped
+            Returns
+            -------
+            array
+                Leftmost derivation as rule IDs
+        """
+        if self.cache is not None:
+            return self.__parseCached(tuple(input))
+        return self.__parseRuleIds(input)
+
+    def __parseCached(self, input):
+        result = self.cache.get(input)
+        if result is None:
+            try:
+                derivation = self.__parseRuleIds(input)
+            except lle.ParsingException as e:
+                self.cache.put(input, copy.copy(e)) #without the traceback, which holds on to the frames of the parser
+                raise
+            self.cache.put(input, array('i', derivation)) #the caller may modify the returned array
+            return derivation
+        if isinstance(result, lle.ParsingException):
+            raise copy.copy(result)
+        return array('i', result)
+
+    def __parseRuleIds(self, input):
+        session = self.session()
+        if self.stats is None:
+            session._consume(input)
+            session._end()
+        else:
+            with self.stats.phase("parse"):
+                session._consume(input)
+                session._end()
+        return session._derivation
+
+    def parseIds(self, input) -> array:
+        """
+            Parses terminals given as IDs of the compiled table (e.g. produced by llgram.tokenizer.Tokenizer.ids)
+            and returns the leftmost derivation as rule IDs, see parseRuleIds. The terminals are not looked up,
+            so the input has to come from the same table.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of terminal IDs
+
+            Returns
+            -------
+            array
+                Leftmost derivation as rule IDs
+        """
+        session = self.session()
+        if self.stats is None:
+            session._consumeIds(input)
+            session._end()
+        else:
+            with self.stats.phase("parse"):
+                session._consumeIds(input)
+                session._end()
+        return session._derivation
+
+    def parseWithRecovery(self, input) -> tuple:
+        """
+            Parses the input without stopping at the first error, so that a single pass finds all errors (panic mode recovery).
+
+            After an error the parser resynchronizes: an expected terminal is assumed to be missing and popped from the stack,
+            a nonterminal without a rule for the current terminal is popped if the terminal can follow it (is in its follow set)
+            and the nonterminal is not the last symbol on the stack, otherwise the terminal is skipped. Unknown terminals are skipped as well.
+            If the derivation is complete before the end of input, the rest of the input is parsed as another sentence.
+            Errors are not reported again until the parser matches a terminal, so one mistake in the input is reported once.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of input terminals
+
+            Returns
+            -------
+            list
+                Best-effort leftmost derivation, nonterminals popped during recovery have no rule in it
+                and every sentence started after the end of the derivation adds its own derivation
+            list
+                ParsingSyntaxException and ParsingLexicalException errors in the order they were found, their position attribute
+                is the position of the offending terminal (the length of the input for the end of input)
+        """
+        compiled = self.compiled
+        actions = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalIds = compiled.inputIds
+        terminalCount = compiled.terminalCount
+        symbols = compiled.symbols
+        synchronizing = self.__synchronizingSets()
+
+        startId = compiled.startId
+        stack = [startId]
+        derivation = array('i')
+        errors = []
+        recovering = False
+        restart = None #length of the derivation when another sentence was started, until it matches a terminal
+
+        position = 0
+        for token in input:
+            terminal = terminalIds.get(token)
+            if terminal is None:
+                errors.append(lle.ParsingLexicalException.unknown(token, position))
+                position += 1
                 continue
-            else:
-                #check for applicable rule
-                try:
-                    rule = self.table[top][first]
-                except KeyError:
-                    raise lle.ParsingLexicalException(f"Terminal \"{first}\" is unknown")
-                if rule:
-                    #rewrite stack
-                    for symbol in reversed(rule.getRight()):
-                        stack.append(symbol)
+            while True:
+                skip = False
+                if not stack:
+                    error = lle.ParsingSyntaxException.afterEnd(token, position)
+                    if restart is None and compiled.lookup(startId, terminal) != NO_RULE:
+                        #the rest of the input is parsed as another sentence
+                        restart = len(derivation)
+                        stack.append(startId)
+                    else:
+                        if restart is not None:
+                            #the new sentence was derived to nothing (the terminal only follows the start symbol), it is dropped
+                            del derivation[restart:]
+                            restart = None
+                        skip = True
+                elif stack[-1] == terminal:
+                    stack.pop()
+                    recovering = False
+                    restart = None
+                    break
+                elif stack[-1] < terminalCount:
+                    #the expected terminal is assumed to be missing
+                    top = stack.pop()
+                    error = lle.ParsingSyntaxException.expected(symbols[top], token, position)
+                else:
+                    top = stack[-1]
+                    rule = actions[rowBase[top] + terminal]
+                    if check[rule] != top:
+                        rule = fill(top, terminal)
+                    if rule != NO_RULE:
+                        stack.pop()
+                        stack.extend(right[rule])
+                        derivation.append(rule)
+                        continue
+                    error = lle.ParsingSyntaxException.noRule(symbols[top], token, position)
+                    if terminal in synchronizing[top] and len(stack) > 1:
+                        stack.pop()
+                    else:
+                        skip = True
 
-                    #print rule
+                if not recovering:
+                    errors.append(error)
+                    recovering = True
+                if skip:
+                    break
+            position += 1
+
+        end = compiled.endId
+        while stack:
+            top = stack.pop()
+            if top < terminalCount:
+                error = lle.ParsingSyntaxException.expected(symbols[top], None, position)
+            else:
+                rule = actions[rowBase[top] + end]
+                if check[rule] != top:
+                    rule = fill(top, end)
+                if rule != NO_RULE:
+                    stack.extend(right[rule])
                     derivation.append(rule)
+                    continue
+                error = lle.ParsingSyntaxException.noRule(symbols[top], None, position)
+            if not recovering:
+                errors.append(error)
+                recovering = True
 
-        #potentialy execute actions
-        if execute:
-            for rule in derivation:
-                if explicitActions:
-                    if actions == None:
-                        if self.actions[rule]:
-                            self.actions[rule]()
-                    else:
-                        if actions[rule]:
-                            actions[rule]()
+        return compiled.getRules(derivation), errors
+
+    def __synchronizingSets(self):
+        if self.__synchronizing is None:
+            compiled = self.compiled
+            followSets = self.followSets
+            if followSets is None:
+                nonterminals = set(compiled.nonterminals)
+                terminals = {symbol for rule in compiled.rules for symbol in rule.getRight() if symbol not in nonterminals}
+                analysis = GrammarAnalysis(compiled.rules, compiled.startSymbol, nonterminals, terminals)
+                analysis.computeEmptySets()
+                analysis.computeFirstSets()
+                analysis.computeFollowSets()
+                followSets = analysis.followSets
+            terminalIds = compiled.terminalIds
+            self.__synchronizing = [frozenset()] * compiled.terminalCount + [
+                frozenset(terminalIds[terminal] for terminal in followSets.get(nonterminal, ()) if terminal in terminalIds)
+                for nonterminal in compiled.nonterminals
+            ]
+        return self.__synchronizing
+
+    def parseTree(self, input) -> ParseTree:
+        """
+            Parses the input and builds its parse tree during parsing.
+            The tree is stored in parallel arrays (see llgram.tree.ParseTree), nodes are only materialized as views on access.
+            Epsilon rules produce nodes without children.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of input terminals
+
+            Returns
+            -------
+            ParseTree
+                Parse tree of the input
+        """
+        compiled = self.compiled
+        table = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalIds = compiled.inputIds
+        terminalCount = compiled.terminalCount
+
+        tree = ParseTree(compiled)
+        symbols = tree.symbol
+        rules = tree.rule
+        firstChild = tree.firstChild
+        nextSibling = tree.nextSibling
+        tokens = tree.token
+        arities = compiled.ruleArity
+        forward = [symbols[::-1] for symbols in right] #right hand sides in their original order
+        empty = [array('i', [NO_NODE]) * arity for arity in range(max(compiled.ruleArity, default=0) + 1)]
+
+        symbols.append(compiled.startId)
+        rules.append(NO_NODE)
+        firstChild.append(NO_NODE)
+        nextSibling.append(NO_NODE)
+        tokens.append(NO_NODE)
+
+        #the node stack runs parallel to the symbol stack
+        stack = [compiled.startId]
+        nodeStack = [0]
+
+        def expand(node, rule):
+            rules[node] = rule
+            arity = arities[rule]
+            if arity:
+                first = len(symbols)
+                firstChild[node] = first
+                symbols.extend(forward[rule])
+                rules.extend(empty[arity])
+                firstChild.extend(empty[arity])
+                tokens.extend(empty[arity])
+                nextSibling.extend(range(first + 1, first + arity))
+                nextSibling.append(NO_NODE)
+                stack.extend(right[rule])
+                nodeStack.extend(range(first + arity - 1, first - 1, -1))
+
+        position = 0
+        for token in input:
+            terminal = terminalIds.get(token)
+            if terminal is None:
+                raise lle.ParsingLexicalException.unknown(token, position)
+            while True:
+                if not stack:
+                    raise lle.ParsingSyntaxException.afterEnd(token, position)
+                top = stack.pop()
+                node = nodeStack.pop()
+                if top == terminal:
+                    tokens[node] = position
+                    break
+                if top < terminalCount:
+                    raise lle.ParsingSyntaxException.expected(compiled.symbols[top], token, position)
+                rule = table[rowBase[top] + terminal]
+                if check[rule] != top:
+                    rule = fill(top, terminal)
+                    if rule == NO_RULE:
+                        raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], token, position)
+                expand(node, rule)
+            position += 1
+
+        end = compiled.endId
+        while stack:
+            top = stack.pop()
+            node = nodeStack.pop()
+            if top < terminalCount:
+                raise lle.ParsingSyntaxException.expected(compiled.symbols[top], None, position)
+            rule = table[rowBase[top] + end]
+            if check[rule] != top:
+                rule = fill(top, end)
+                if rule == NO_RULE:
+                    raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], None, position)
+            expand(node, rule)
+
+        return tree
+
+    def session(self):
+        """
+            Starts a push-based parsing session. Terminals are fed to the session one by one (or in batches) and the derivation
+            is returned as it is produced.
+
+            Returns
+            -------
+            ParserSession
+                A new parsing session over this parser's table
+        """
+        return ParserSession(self.compiled, self.stats)
+
+    def iterParse(self, input):
+        """
+            Parses the input lazily, yielding the rules of the leftmost derivation as they are produced.
+            The input can be any iterable (e.g. a generator reading a file), it is never copied.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of input terminals
+
+            Yields
+            ------
+            Rule
+                The next rule of the leftmost derivation
+        """
+        session = self.session()
+        rules = self.compiled.rules
+        pending = session._derivation
+
+        for token in input:
+            session._consume((token,))
+            if pending:
+                for rule in pending:
+                    yield rules[rule]
+                del pending[:]
+
+        session._end()
+        for rule in pending:
+            yield rules[rule]
+        del pending[:]
+
+    def parse_many(self, inputs, workers: int=None, chunksize: int=64, ordered: bool=True):
+        """
+            Parses many independent inputs across a pool of worker processes.
+            The compiled table is sent to every worker once, when the worker starts. Inputs are sent in chunks.
+
+            Errors do not abort the batch, the exception (ParsingSyntaxException or ParsingLexicalException) is returned in place of the derivation.
+
+            Parameters
+            ----------
+            inputs: iterable
+                Iterable of inputs, each a list of terminals
+
+            workers: int
+                Number of worker processes, defaults to the number of CPUs. With 1 worker the inputs are parsed in this process.
+
+            chunksize: int
+                Number of inputs sent to a worker at once
+
+            ordered: bool
+                If true, results are yielded in the order of the inputs. Otherwise they are yielded as soon as they are ready.
+
+            Yields
+            ------
+            list or ParsingException
+                If ordered, the leftmost derivation (or the error) of each input
+            tuple
+                If not ordered, (index of the input, derivation or error) pairs
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        getRules = self.compiled.getRules
+
+        if workers <= 1:
+            compiled = self.compiled
+            results = (_parseTask(compiled, task) for task in enumerate(inputs))
+        else:
+            pool = multiprocessing.Pool(workers, initializer=_initWorker, initargs=(self.compiled,))
+            if ordered:
+                results = pool.imap(_parseInWorker, enumerate(inputs), chunksize)
+            else:
+                results = pool.imap_unordered(_parseInWorker, enumerate(inputs), chunksize)
+
+        try:
+            for index, derivation, error in results:
+                result = error if derivation is None else getRules(derivation)
+                if ordered:
+                    yield result
                 else:
-                    rule.getAction()()
-        
-        return derivation
\ No newline at end of file
+                    yield index, result
+        finally:
+            if workers > 1:
+                pool.terminate()
+
+    def accepts(self, input) -> "AcceptResult":
+        """
+            Checks whether the input is a sentence of the grammar without building a derivation (a recognizer).
+            Errors are returned instead of raised, unknown terminals are reported as syntax errors.
+
+            The loop only pushes right hand sides: the row of every nonterminal is precomputed as a dictionary
+            of the terminals it accepts (its accept set) and the right hand sides it pushes for them, so no rule IDs are involved.
+
+            Parameters
+            ----------
+            input: iterable
+                Iterable of input terminals
+
+            Returns
+            -------
+            AcceptResult
+                Result that is true if the input was accepted, otherwise holding the position of the error and the expected terminals
+        """
+        if self.__recognizer is None:
+            self.__recognizer = _recognizer(self.compiled)
+        return _accepts(self.compiled, self.__recognizer, input)
+
+    def accepts_many(self, inputs, workers: int=1, chunksize: int=256, ordered: bool=True):
+        """
+            Checks many independent inputs, see accepts. With more than one worker, the inputs are checked across a pool
+            of worker processes like in parse_many.
+
+            Parameters
+            ----------
+            inputs: iterable
+                Iterable of inputs, each an iterable of terminals
+
+            workers: int
+                Number of worker processes, None for the number of CPUs. With 1 worker the inputs are checked in this process.
+
+            chunksize: int
+                Number of inputs sent to a worker at once
+
+            ordered: bool
+                If true, results are yielded in the order of the inputs. Otherwise they are yielded as soon as they are ready.
+
+            Yields
+            ------
+            AcceptResult
+                If ordered, the result of each input
+            tuple
+                If not ordered, (index of the input, result) pairs
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1:
+            for index, input in enumerate(inputs):
+                result = self.accepts(input)
+                yield result if ordered else (index, result)
+            return
+
+        pool = multiprocessing.Pool(workers, initializer=_initAcceptWorker, initargs=(self.compiled,))
+        try:
+            if ordered:
+                for _, result in pool.imap(_acceptsInWorker, enumerate(inputs), chunksize):
+                    yield result
+            else:
+                yield from pool.imap_unordered(_acceptsInWorker, enumerate(inputs), chunksize)
+        finally:
+            pool.terminate()
+
+class AcceptResult:
+    def __init__(self, position: int=None, expected: frozenset=frozenset()):
+        """
+            Result of LLParser.accepts, true if the input was accepted.
+
+            Parameters
+            ----------
+            position: int
+                Position of the first terminal that can't be parsed (the length of the input for the end of input), None if accepted
+
+            expected: frozenset
+                Terminals accepted by the symbol on top of the stack at the position (for a nonterminal the terminals of its row),
+                the end symbol (llgram.constants.END_SYMBOL) stands for the end of input
+        """
+        self.position = position
+        self.expected = expected
+
+    def __bool__(self):
+        return self.position is None
+
+    def __repr__(self):
+        if self.position is None:
+            return "AcceptResult(accepted)"
+        return f"AcceptResult(position={self.position}, expected={sorted(self.expected)})"
+
+_ACCEPTED = AcceptResult() #shared result of every accepted input
+
+#the recognizer stack holds one dictionary per symbol, {terminal:symbols pushed for it} for a nonterminal (its row with
+#the right hand sides in reversed order) and {terminal:_MATCH} for a terminal, so a step is one pop and one lookup
+_MATCH = object() #lookup result of a terminal matching itself
+_END = object() #key of the end of input in the symbol dictionaries, a "__$" token in the input matches no key
+_BOTTOM = {} #bottom of the recognizer stack, matches no terminal
+
+def _recognizer(compiled):
+    """
+        Builds the symbol dictionaries of the recognizer (see _accepts). Rows a lazy table didn't load yet are left empty
+        and loaded when a lookup misses them, unloaded maps the id of their dictionary to the symbol ID.
+    """
+    nodes = [{terminal:_MATCH} for terminal in compiled.terminals] + [{} for _ in compiled.nonterminals]
+    unloaded = {}
+    for symbolId in range(compiled.terminalCount, len(compiled.symbols)):
+        if symbolId in compiled.pending:
+            unloaded[id(nodes[symbolId])] = symbolId
+        else:
+            _loadNode(compiled, nodes, symbolId)
+    return nodes, unloaded
+
+def _loadNode(compiled, nodes, symbolId):
+    symbols = compiled.symbols
+    right = compiled.ruleRight
+    end = compiled.endId
+    nodes[symbolId].update({_END if terminal == end else symbols[terminal]:tuple(nodes[symbol] for symbol in right[rule]) for terminal, rule in compiled.row(symbolId).items()})
+
+def _accepts(compiled, recognizer, input):
+    nodes, unloaded = recognizer
+    stack = [_BOTTOM, nodes[compiled.startId]]
+    pop = stack.pop
+    pushRight = stack.extend
+
+    position = 0
+    for token in input:
+        while True:
+            top = pop()
+            pushed = top.get(token)
+            if pushed is _MATCH:
+                break
+            if pushed is None:
+                if id(top) not in unloaded:
+                    return _rejected(top, position)
+                _loadNode(compiled, nodes, unloaded.pop(id(top)))
+                stack.append(top)
+                continue
+            pushRight(pushed)
+        position += 1
+
+    end = _END
+    while True:
+        top = pop()
+        if top is _BOTTOM:
+            return _ACCEPTED
+        pushed = top.get(end)
+        if pushed is None:
+            if id(top) not in unloaded:
+                return _rejected(top, position)
+            _loadNode(compiled, nodes, unloaded.pop(id(top)))
+            stack.append(top)
+            continue
+        pushRight(pushed)
+
+def _rejected(top, position):
+    if top is _BOTTOM:
+        return AcceptResult(position, frozenset((const.END_SYMBOL,)))
+    return AcceptResult(position, frozenset(const.END_SYMBOL if terminal is _END else terminal for terminal in top))
+
+def _noValue(*values):
+    return None
+
+class _MissingAction:
+    def __init__(self, rule):
+        self.rule = rule
+
+    def __call__(self, *values):
+        raise lle.ParsingActionMissingException(self.rule)
+
+class ParserSession:
+    def __init__(self, compiled: CompiledTable, stats=None):
+        """
+            Push-based LL parser. Every call does work proportional to the number of terminals fed and the number of rules
+            applied, the only state kept between calls is the parsing stack.
+
+            After a ParsingException the session is left in an undefined state and should be discarded.
+
+            Parameters
+            ----------
+            compiled: CompiledTable
+                Table to parse with
+
+            stats: Stats
+                If given, the session counts terminals, table lookups, the largest stack depth and rule uses in it (see LLParser)
+        """
+        self.compiled = compiled
+        self.stats = stats
+        self.stack = [compiled.startId]
+        self.position = 0 #number of terminals consumed so far
+        self.finished = False
+        self._derivation = array('i') #rule IDs produced but not yet returned
+
+    def feed(self, token) -> list:
+        """
+            Feeds a single terminal to the parser.
+
+            Returns
+            -------
+            list
+                Rules applied before the terminal could be matched
+        """
+        self._consume((token,))
+        return self.__take()
+
+    def feed_many(self, tokens) -> list:
+        """
+            Feeds an iterable of terminals to the parser.
+
+            Returns
+            -------
+            list
+                Rules applied while matching the terminals
+        """
+        self._consume(tokens)
+        return self.__take()
+
+    def finish(self) -> list:
+        """
+            Signals the end of input.
+
+            Returns
+            -------
+            list
+                Rules applied to derive the remaining (nullable) nonterminals
+
+            Raises
+            ------
+            ParsingSyntaxException
+                If the input fed so far is not a complete sentence
+        """
+        self._end()
+        return self.__take()
+
+    def __take(self):
+        rules = self.compiled.getRules(self._derivation)
+        del self._derivation[:]
+        return rules
+
+    def _consume(self, tokens):
+        if self.finished:
+            raise lle.ParsingSyntaxException("Input was fed after the end of input", self.position)
+        if self.stats is not None:
+            return self.__consumeCounted(tokens)
+
+        compiled = self.compiled
+        macros = compiled.macros
+        expand = compiled.macro
+        terminalIds = compiled.inputIds
+        terminalCount = compiled.terminalCount
+
+        stack = self.stack
+        derive = self._derivation.extend
+        push = stack.extend
+        pop = stack.pop
+
+        position = self.position
+        try:
+            for token in tokens:
+                terminal = terminalIds.get(token)
+                if terminal is None:
+                    raise lle.ParsingLexicalException.unknown(token, position)
+                while True:
+                    if not stack:
+                        raise lle.ParsingSyntaxException.afterEnd(token, position)
+                    top = pop()
+                    if top == terminal: # symbols match, consume them and carry on
+                        break
+                    #the whole chain of expansions down to the terminal is applied at once, see CompiledTable.macro
+                    macro = macros.get(top * terminalCount + terminal)
+                    if macro is None:
+                        if top < terminalCount:
+                            raise lle.ParsingSyntaxException.expected(compiled.symbols[top], token, position)
+                        macro = expand(top, terminal)
+                        if macro is None:
+                            raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], token, position)
+                    #rewrite stack
+                    symbols, rules, matched = macro
+                    push(symbols)
+                    derive(rules)
+                    if matched:
+                        break
+                position += 1
+        finally:
+            self.position = position
+
+    def _consumeIds(self, terminals):
+        #_consume for terminal IDs
+        if self.finished:
+            raise lle.ParsingSyntaxException("Input was fed after the end of input", self.position)
+        compiled = self.compiled
+        if self.stats is not None:
+            symbols = compiled.terminals
+            return self.__consumeCounted(symbols[terminal] for terminal in terminals)
+
+        macros = compiled.macros
+        expand = compiled.macro
+        terminalCount = compiled.terminalCount
+        end = compiled.endId
+
+        stack = self.stack
+        derive = self._derivation.extend
+        push = stack.extend
+        pop = stack.pop
+
+        position = self.position
+        try:
+            for terminal in terminals:
+                if terminal == end:
+                    raise lle.ParsingLexicalException.unknown(compiled.symbols[terminal], position)
+                while True:
+                    if not stack:
+                        raise lle.ParsingSyntaxException.afterEnd(compiled.symbols[terminal], position)
+                    top = pop()
+                    if top == terminal:
+                        break
+                    macro = macros.get(top * terminalCount + terminal)
+                    if macro is None:
+                        if top < terminalCount:
+                            raise lle.ParsingSyntaxException.expected(compiled.symbols[top], compiled.symbols[terminal], position)
+                        macro = expand(top, terminal)
+                        if macro is None:
+                            raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], compiled.symbols[terminal], position)
+                    symbols, rules, matched = macro
+                    push(symbols)
+                    derive(rules)
+                    if matched:
+                        break
+                position += 1
+        finally:
+            self.position = position
+
+    def _end(self):
+        if self.finished:
+            return
+        self.finished = True
+        if self.stats is not None:
+            return self.__endCounted()
+
+        compiled = self.compiled
+        actions = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalCount = compiled.terminalCount
+        end = compiled.endId
+
+        #end of input, only nullable nonterminals may remain on the stack
+        stack = self.stack
+        derive = self._derivation.append
+        while stack:
+            top = stack.pop()
+            if top < terminalCount:
+                raise lle.ParsingSyntaxException.expected(compiled.symbols[top], None, self.position)
+            rule = actions[rowBase[top] + end]
+            if check[rule] != top:
+                rule = fill(top, end)
+                if rule == NO_RULE:
+                    raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], None, self.position)
+            stack.extend(right[rule])
+            derive(rule)
+
+    def __consumeCounted(self, tokens):
+        #_consume counting into self.stats, kept separate so that the uninstrumented loop pays nothing for the counters
+        compiled = self.compiled
+        actions = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalIds = compiled.inputIds
+        terminalCount = compiled.terminalCount
+
+        stack = self.stack
+        derive = self._derivation.append
+        hits = {}
+        lookups = 0
+        depth = len(stack)
+
+        position = self.position
+        start = position
+        try:
+            for token in tokens:
+                terminal = terminalIds.get(token)
+                if terminal is None:
+                    raise lle.ParsingLexicalException.unknown(token, position)
+                while True:
+                    if not stack:
+                        raise lle.ParsingSyntaxException.afterEnd(token, position)
+                    top = stack.pop()
+                    if top == terminal:
+                        break
+                    if top < terminalCount:
+                        raise lle.ParsingSyntaxException.expected(compiled.symbols[top], token, position)
+                    rule = actions[rowBase[top] + terminal]
+                    lookups += 1
+                    if check[rule] != top:
+                        rule = fill(top, terminal)
+                        if rule == NO_RULE:
+                            raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], token, position)
+                    stack.extend(right[rule])
+                    derive(rule)
+                    hits[rule] = hits.get(rule, 0) + 1
+                    if len(stack) > depth:
+                        depth = len(stack)
+                position += 1
+        finally:
+            self.position = position
+            self.__record(position - start, lookups, depth, hits)
+
+    def __endCounted(self):
+        compiled = self.compiled
+        actions = compiled.actions
+        rowBase = compiled.rowBase
+        check = compiled.ruleCheck
+        fill = compiled.fill
+        right = compiled.ruleRight
+        terminalCount = compiled.terminalCount
+        end = compiled.endId
+
+        stack = self.stack
+        derive = self._derivation.append
+        hits = {}
+        lookups = 0
+        depth = len(stack)
+        try:
+            while stack:
+                top = stack.pop()
+                if top < terminalCount:
+                    raise lle.ParsingSyntaxException.expected(compiled.symbols[top], None, self.position)
+                rule = actions[rowBase[top] + end]
+                lookups += 1
+                if check[rule] != top:
+                    rule = fill(top, end)
+                    if rule == NO_RULE:
+                        raise lle.ParsingSyntaxException.noRule(compiled.symbols[top], None, self.position)
+                stack.extend(right[rule])
+                derive(rule)
+                hits[rule] = hits.get(rule, 0) + 1
+                if len(stack) > depth:
+                    depth = len(stack)
+        finally:
+            self.__record(0, lookups, depth, hits)
+
+    def __record(self, tokens, lookups, depth, hits):
+        stats = self.stats
+        rules = self.compiled.rules
+        stats.add("tokens", tokens)
+        stats.add("lookups", lookups)
+        stats.maximum("maxStackDepth", depth)
+        stats.addRuleHits({rules[rule]:count for rule, count in hits.items()})
+
+_workerTable = None #table of the current worker process, see LLParser.parse_many
+
+def _initWorker(compiled):
+    global _workerTable
+    _workerTable = compiled
+
+def _parseInWorker(task):
+    return _parseTask(_workerTable, task)
+
+_workerRecognizer = None #recognizer of the table of the current worker process, see LLParser.accepts_many
+
+def _initAcceptWorker(compiled):
+    global _workerTable, _workerRecognizer
+    _workerTable = compiled
+    _workerRecognizer = _recognizer(compiled)
+
+def _acceptsInWorker(task):
+    index, input = task
+    return index, _accepts(_workerTable, _workerRecognizer, input)
+
+def _parseTask(compiled, task):
+    index, input = task
+    session = ParserSession(compiled)
+    try:
+        session._consume(input)
+        session._end()
+    except lle.ParsingException as e:
+        return index, None, e
+    return index, session._derivation, None
@@ -0,0 +1,41 @@
+import json
+import struct
+
+#every message is a JSON object preceded by its length in bytes (4 bytes, big endian)
+HEADER = struct.Struct(">I")
+MAX_MESSAGE = 64 * 1024 * 1024 #longest message accepted in bytes
+
+#operations of the protocol
+PARSE = "parse" #{"tokens":[...]} -> {"derivation":[rule IDs]}
+VALIDATE = "validate" #{"tokens":[...]} -> {"accepted":bool, "position":int or null, "expected":[terminals]}
+RULES = "rules" #{} -> {"startSymbol":str, "rules":[[left, [right]]]}, the rules the rule IDs of derivations index
+
+def encodeMessage(message: dict) -> bytes:
+    """
+        Encodes a message of the protocol (a JSON object) with its length prefix
+    """
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+async def readMessage(reader):
+    """
+        Reads one message from an asyncio.StreamReader.
+
+        Returns
+        -------
+        dict
+            The message, None at the end of the stream
+
+        Raises
+        ------
+        ValueError
+            If the message is longer than MAX_MESSAGE or isn't valid JSON
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except EOFError: #asyncio.IncompleteReadError, caught by its base so that clients don't have to import asyncio
+        return None
+    size, = HEADER.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Message of {size} bytes is longer than {MAX_MESSAGE} bytes")
+    return json.loads(await reader.readexactly(size))
@@ -28,6 +28,9 @@ class Rule:
     def getRight(self):
         return self.right
 
+    def setRight(self, val):
+        self.right = val
+
     def appendRight(self, val):
         self.right.append(val)
 
@@ -0,0 +1,228 @@
+import sys
+import json
+import mmap
+import struct
+from array import array
+
+from llgram import constants as const
+from llgram.rule import Rule
+from llgram.compiled import CompiledTable
+
+FORMAT_VERSION = 2 #version written, version 2 added compressed tables
+READ_VERSIONS = (1, 2) #versions that can be loaded
+
+JSON_FORMAT = "llgram-table"
+
+BINARY_MAGIC = b"LLGT"
+#magic, version, terminal count, nonterminal count, rule count, start symbol ID, symbol table size (bytes), rule table size (ints)
+BINARY_HEADER_V1 = struct.Struct("<4sIIIIIII")
+#version 1 header followed by the action table size (ints) and flags
+BINARY_HEADER = struct.Struct("<4sIIIIIIIII")
+COMPRESSED_FLAG = 1 #the action table is compressed, the offsets of the rows precede it
+EPSILON_ID = -1 #stands for the epsilon symbol in the rule table
+
+def saveJson(table, fout, indent=None):
+    """
+        Writes a parsing table in the lossless JSON format.
+
+        Parameters
+        ----------
+        table: CompiledTable or TableGenerator
+            Table to save
+
+        fout : file
+            A text file open for writing
+
+        indent: int
+            indent of the json file, defaults to a compact file
+    """
+    compiled = CompiledTable.fromGenerator(table, lazy=False)
+    symbolIds = compiled.symbolIds
+    terminals = compiled.terminals
+    rows = {}
+    for nonterminal in compiled.nonterminals:
+        rows[nonterminal] = {terminals[terminal]:rule for terminal, rule in compiled.row(symbolIds[nonterminal]).items()}
+
+    json.dump({
+        "format": JSON_FORMAT,
+        "version": FORMAT_VERSION,
+        "compressed": compiled.compressed,
+        "startSymbol": compiled.startSymbol,
+        "terminals": compiled.terminals,
+        "nonterminals": compiled.nonterminals,
+        "rules": [[rule.getLeft(), rule.getRight()] for rule in compiled.rules],
+        "table": rows,
+    }, fout, indent=indent)
+
+def loadJson(fin) -> CompiledTable:
+    """
+        Reads a parsing table saved by saveJson. The table is compressed if it was compressed when saved.
+
+        Parameters
+        ----------
+        fin : file
+            A text file open for reading
+
+        Returns
+        -------
+        CompiledTable
+            The loaded table, which can be passed to LLParser directly
+    """
+    data = json.load(fin)
+    if data.get("format") != JSON_FORMAT:
+        raise ValueError("Not an llgram table")
+    if data.get("version") not in READ_VERSIONS:
+        raise ValueError(f"Unsupported table version {data.get('version')}")
+
+    terminals = data["terminals"]
+    nonterminals = data["nonterminals"]
+    rules = [_rule(left, right) for left, right in data["rules"]]
+    terminalIds = {terminal:i for i, terminal in enumerate(terminals)}
+
+    rows = [{terminalIds[terminal]:rule for terminal, rule in data["table"].get(nonterminal, {}).items()} for nonterminal in nonterminals]
+    return CompiledTable.fromRows(terminals, nonterminals, rules, data["startSymbol"], rows, data.get("compressed", False))
+
+def saveBinary(table, fout, compress: bool=False):
+    """
+        Writes a parsing table in the compact binary format: a header, the symbol table, the rule table, the offsets of the rows
+        (only for a compressed table) and the action table.
+        All integers are little endian, the action table is aligned to 4 bytes so it can be used directly from a memory map.
+
+        Parameters
+        ----------
+        table: CompiledTable or TableGenerator
+            Table to save
+
+        fout : file
+            A binary file open for writing
+
+        compress: bool
+            If true, the table is saved compressed (see llgram.compiled.CompiledTable.compress). A compressed table is always saved compressed.
+    """
+    compiled = CompiledTable.fromGenerator(table, compress, lazy=False)
+    compiled.complete()
+    symbolIds = compiled.symbolIds
+
+    symbols = "\0".join(compiled.symbols).encode("utf-8")
+
+    #every rule is stored as: left hand side, length of the right hand side, right hand side symbols
+    rules = array('i')
+    for rule in compiled.rules:
+        right = rule.getRight()
+        rules.append(symbolIds[rule.getLeft()])
+        rules.append(len(right))
+        rules.extend(EPSILON_ID if symbol == const.EPSILON_SYMBOL else symbolIds[symbol] for symbol in right)
+
+    rowBase = array('i', compiled.rowBase[compiled.terminalCount:] if compiled.compressed else [])
+    actions = array('i', compiled.actions)
+    if sys.byteorder != "little":
+        rules.byteswap()
+        rowBase.byteswap()
+        actions.byteswap()
+
+    fout.write(BINARY_HEADER.pack(BINARY_MAGIC, FORMAT_VERSION, len(compiled.terminals), len(compiled.nonterminals),
+        len(compiled.rules), compiled.startId, len(symbols), len(rules), len(actions), COMPRESSED_FLAG if compiled.compressed else 0))
+    fout.write(symbols)
+    fout.write(b"\0" * _padding(BINARY_HEADER.size + len(symbols)))
+    fout.write(rules.tobytes())
+    fout.write(rowBase.tobytes())
+    fout.write(actions.tobytes())
+
+def loadBinary(path: str, useMmap: bool=True) -> CompiledTable:
+    """
+        Reads a parsing table saved by saveBinary, in the current or an older version of the format.
+
+        With useMmap, the file is memory mapped and the action table is a zero-copy view of the mapping,
+        so processes loading the same file share one copy of the table in the page cache.
+
+        Parameters
+        ----------
+        path: str
+            Path to the file
+
+        useMmap: bool
+            If true, the action table is used directly from a memory map of the file, otherwise it is read into memory
+
+        Returns
+        -------
+        CompiledTable
+            The loaded table, which can be passed to LLParser directly
+    """
+    with open(path, "rb") as fin:
+        if useMmap:
+            data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = fin.read()
+
+    view = memoryview(data)
+    magic, version, terminalCount, nonterminalCount, ruleCount, startId, symbolsSize, rulesSize = BINARY_HEADER_V1.unpack_from(view)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not an llgram table")
+    if version not in READ_VERSIONS:
+        raise ValueError(f"Unsupported table version {version}")
+
+    if version == 1:
+        header = BINARY_HEADER_V1
+        actionsSize, flags = terminalCount * nonterminalCount, 0
+    else:
+        header = BINARY_HEADER
+        actionsSize, flags = BINARY_HEADER.unpack_from(view)[8:]
+
+    offset = header.size
+    symbols = bytes(view[offset:offset + symbolsSize]).decode("utf-8").split("\0")
+    offset += symbolsSize + _padding(offset + symbolsSize)
+
+    rules = array('i')
+    rules.frombytes(view[offset:offset + rulesSize * 4])
+    offset += rulesSize * 4
+
+    rowBase = None
+    if flags & COMPRESSED_FLAG:
+        rowBase = array('i')
+        rowBase.frombytes(view[offset:offset + nonterminalCount * 4])
+        if sys.byteorder != "little":
+            rowBase.byteswap()
+        offset += nonterminalCount * 4
+
+    actionsSize *= 4
+    if sys.byteorder == "little":
+        actions = view[offset:offset + actionsSize].cast('i')
+    else:
+        rules.byteswap()
+        actions = array('i')
+        actions.frombytes(view[offset:offset + actionsSize])
+        actions.byteswap()
+
+    ruleList = []
+    i = 0
+    for _ in range(ruleCount):
+        length = rules[i + 1]
+        right = [const.EPSILON_SYMBOL if symbol == EPSILON_ID else symbols[symbol] for symbol in rules[i + 2:i + 2 + length]]
+        ruleList.append(_rule(symbols[rules[i]], right))
+        i += 2 + length
+
+    compiled = CompiledTable(symbols[:terminalCount], symbols[terminalCount:], ruleList, symbols[startId], actions, rowBase)
+    if useMmap:
+        compiled.path = path
+    return compiled
+
+def load(path: str) -> CompiledTable:
+    """
+        Reads a parsing table saved in either format, the binary format is memory mapped.
+    """
+    with open(path, "rb") as fin:
+        magic = fin.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        return loadBinary(path)
+    with open(path, "r", encoding="utf-8") as fin:
+        return loadJson(fin)
+
+def _padding(size):
+    return -size % 4
+
+def _rule(left, right):
+    rule = Rule()
+    rule.setLeft(left)
+    for symbol in right:
+        rule.appendRight(symbol)
+    return rule
@@ -0,0 +1,295 @@
+import os
+import sys
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from llgram import llexceptions as lle
+from llgram import serialization
+from llgram.generation import TableGenerator
+from llgram.parsing import LLParser
+from llgram.protocol import PARSE, VALIDATE, RULES, encodeMessage, readMessage
+
+class ParseServer:
+    def __init__(self, grammars: dict, workers: int=0, batchSize: int=64, batchDelay: float=0.0005, queueSize: int=1024, pipeline: int=256):
+        """
+            Long-lived asyncio server parsing and validating inputs with tables loaded once at startup.
+
+            Clients (see llgram.client) send length-prefixed JSON requests {"id", "op", "grammar", "tokens"} (see llgram.protocol) over a Unix or TCP socket
+            and get a response {"id", "ok", ...} for every request, in the order of the requests of the connection.
+            Requests of all connections are collected in micro-batches: a batch is processed once batchSize requests are waiting,
+            or batchDelay seconds after its first request. The queue of waiting requests is bounded, when it is full
+            the server stops reading from the connections until it has room again (backpressure).
+
+            Batches are parsed in the event loop, or with workers in a pool of processes, each holding its own parsers.
+
+            Parameters
+            ----------
+            grammars: dict
+                Grammars served by name, each an LLParser, a TableGenerator, a CompiledTable or the path to a grammar file
+
+            workers: int
+                Number of worker processes, 0 to parse in the server process
+
+            batchSize: int
+                Largest number of requests processed together
+
+            batchDelay: float
+                Time in seconds a batch waits for more requests, 0 to process the requests that are already waiting
+
+            queueSize: int
+                Largest number of requests waiting for a batch
+
+            pipeline: int
+                Largest number of requests of one connection waiting for their responses
+        """
+        self.parsers = {name:_parser(grammar) for name, grammar in grammars.items()}
+        self.workers = workers
+        self.batchSize = batchSize
+        self.batchDelay = batchDelay
+        self.queueSize = queueSize
+        self.pipeline = pipeline
+
+        self.__queue = None #(request, future) pairs waiting for a batch
+        self.__pool = None
+        self.__slots = None #limits the batches processed by the pool at once
+        self.__batcher = None
+        self.__server = None
+        self.__connections = set() #tasks serving the open connections
+        self.__batchTasks = set() #batches processed by the pool, referenced until they are done
+
+    async def start(self, path: str=None, host: str="127.0.0.1", port: int=0):
+        """
+            Starts serving on a Unix socket (if path is given) or a TCP socket.
+
+            Returns
+            -------
+            asyncio.AbstractServer
+                The listening server, e.g. for the port chosen for port 0 (server.sockets[0].getsockname())
+        """
+        self.__queue = asyncio.Queue(self.queueSize)
+        if self.workers > 0:
+            tables = {name:parser.compiled for name, parser in self.parsers.items()}
+            self.__pool = ProcessPoolExecutor(self.workers, initializer=_initWorker, initargs=(tables,))
+            self.__slots = asyncio.Semaphore(2 * self.workers)
+        self.__batcher = asyncio.ensure_future(self.__batches())
+
+        if path is not None:
+            self.__server = await asyncio.start_unix_server(self.__connection, path)
+        else:
+            self.__server = await asyncio.start_server(self.__connection, host, port)
+        return self.__server
+
+    async def serve(self, path: str=None, host: str="127.0.0.1", port: int=0):
+        """
+            Starts serving (see start) and serves until cancelled
+        """
+        server = await self.start(path, host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+            Stops serving, closes the open connections and shuts the worker pool down
+        """
+        if self.__server is not None:
+            self.__server.close()
+            connections = list(self.__connections)
+            for connection in connections:
+                connection.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await self.__server.wait_closed()
+            self.__server = None
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            self.__batcher = None
+        for task in list(self.__batchTasks):
+            task.cancel()
+        if self.__pool is not None:
+            self.__pool.shutdown(cancel_futures=True)
+            self.__pool = None
+
+    async def __connection(self, reader, writer):
+        #requests are read and queued here, the responses are written in the order of the requests by __send
+        task = asyncio.current_task()
+        self.__connections.add(task)
+        responses = asyncio.Queue(self.pipeline)
+        sender = asyncio.ensure_future(self.__send(writer, responses))
+        try:
+            await self.__receive(reader, responses)
+            await responses.put(None)
+            await sender
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            pass #cancelled by close, ending normally keeps asyncio from reporting the connection as failed
+        finally:
+            sender.cancel()
+            writer.close()
+            self.__connections.discard(task)
+
+    async def __receive(self, reader, responses):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                request = await readMessage(reader)
+            except (ValueError, UnicodeDecodeError) as e:
+                #the stream can't be read any further
+                await responses.put(_failure(None, e))
+                return
+            if request is None:
+                return
+            if not isinstance(request, dict):
+                await responses.put(_failure(None, ValueError("A request has to be a JSON object")))
+                continue
+            future = loop.create_future()
+            await responses.put((request.get("id"), future))
+            await self.__queue.put((request, future))
+
+    async def __send(self, writer, responses):
+        #after the client went away the responses are still taken, so that the reading side never waits for room
+        connected = True
+        while True:
+            item = await responses.get()
+            if item is None:
+                break
+            if isinstance(item, dict):
+                response = item
+            else:
+                id, future = item
+                response = await future
+                response["id"] = id
+            if connected:
+                writer.write(encodeMessage(response))
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    async def __batches(self):
+        queue = self.__queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batchSize and not queue.empty():
+                batch.append(queue.get_nowait())
+            if len(batch) < self.batchSize and self.batchDelay > 0:
+                await asyncio.sleep(self.batchDelay)
+                while len(batch) < self.batchSize and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+            if self.__pool is None:
+                _resolve(batch, _respondAll(self.parsers, [request for request, _ in batch]))
+            else:
+                await self.__slots.acquire()
+                task = asyncio.ensure_future(self.__inPool(batch))
+                self.__batchTasks.add(task)
+                task.add_done_callback(self.__batchTasks.discard)
+
+    async def __inPool(self, batch):
+        try:
+            loop = asyncio.get_running_loop()
+            responses = await loop.run_in_executor(self.__pool, _respondInWorker, [request for request, _ in batch])
+        except Exception as e:
+            responses = [_failure(None, e)] * len(batch)
+        finally:
+            self.__slots.release()
+        _resolve(batch, responses)
+
+def _parser(grammar):
+    if isinstance(grammar, LLParser):
+        return grammar
+    if isinstance(grammar, (str, os.PathLike)):
+        grammar = TableGenerator.fromFile(grammar)
+    return LLParser(grammar)
+
+def _resolve(batch, responses):
+    for (_, future), response in zip(batch, responses):
+        if not future.done():
+            future.set_result(dict(response))
+
+def _respondAll(parsers, requests):
+    return [_respond(parsers, request) for request in requests]
+
+def _respond(parsers, request):
+    #every error ends up in the response, an exception escaping here would stop the batches of all connections
+    op = request.get("op")
+    try:
+        grammar = request.get("grammar")
+        if not isinstance(grammar, str) or grammar not in parsers:
+            return _failure(None, ValueError(f"Unknown grammar \"{grammar}\""))
+        parser = parsers[grammar]
+        if op == PARSE:
+            return {"ok":True, "derivation":parser.parseRuleIds(_tokens(request)).tolist()}
+        if op == VALIDATE:
+            result = parser.accepts(_tokens(request))
+            return {"ok":True, "accepted":bool(result), "position":result.position, "expected":sorted(result.expected)}
+        if op == RULES:
+            compiled = parser.compiled
+            return {"ok":True, "startSymbol":compiled.startSymbol, "rules":[[rule.getLeft(), rule.getRight()] for rule in compiled.rules]}
+    except lle.LLException as e:
+        return _failure(None, e)
+    except (KeyError, TypeError, ValueError) as e:
+        return _failure(None, ValueError(f"Malformed \"{op}\" request: {e!r}"))
+    except Exception as e:
+        return _failure(None, e)
+    return _failure(None, ValueError(f"Unknown operation \"{op}\""))
+
+def _tokens(request):
+    tokens = request["tokens"]
+    if not isinstance(tokens, list):
+        raise TypeError(f"tokens has to be a list, got {type(tokens).__name__}")
+    return tokens
+
+def _failure(id, error):
+    failure = {"ok":False, "error":{"type":type(error).__name__, "message":str(error)}}
+    if isinstance(error, lle.LLException):
+        failure["error"]["code"] = error.errCode
+        failure["error"]["position"] = getattr(error, "position", None)
+    if id is not None:
+        failure["id"] = id
+    return failure
+
+_workerParsers = None #parsers of the current worker process, see ParseServer
+
+def _initWorker(tables):
+    global _workerParsers
+    _workerParsers = {name:LLParser(table) for name, table in tables.items()}
+
+def _respondInWorker(requests):
+    return _respondAll(_workerParsers, requests)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m llgram.server", description="Serves parse and validate requests for llgram grammars.")
+    parser.add_argument("--grammar", action="append", default=[], metavar="NAME=PATH", help="grammar file served under NAME, can be repeated")
+    parser.add_argument("--table", action="append", default=[], metavar="NAME=PATH", help="table saved by llgram.serialization served under NAME, can be repeated")
+    parser.add_argument("--unix", metavar="PATH", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7420, help="TCP port (default: 7420)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes parsing the batches (default: 0, parse in the server)")
+    parser.add_argument("--batch-size", type=int, default=64, help="largest number of requests processed together")
+    parser.add_argument("--batch-delay", type=float, default=0.0005, help="seconds a batch waits for more requests")
+    parser.add_argument("--queue-size", type=int, default=1024, help="largest number of requests waiting for a batch")
+    parser.add_argument("--lazy", action="store_true", help="compute the table rows of grammar files on first use")
+    arguments = parser.parse_args(argv)
+
+    grammars = {}
+    for option, load in ((arguments.grammar, lambda path: TableGenerator.fromFile(path, lazy=arguments.lazy)), (arguments.table, serialization.load)):
+        for item in option:
+            name, separator, path = item.partition("=")
+            if not separator or not name or not path:
+                parser.error(f"expected NAME=PATH, got \"{item}\"")
+            grammars[name] = load(path)
+    if not grammars:
+        parser.error("no grammar given, use --grammar or --table")
+
+    server = ParseServer(grammars, arguments.workers, arguments.batch_size, arguments.batch_delay, arguments.queue_size)
+    try:
+        asyncio.run(server.serve(arguments.unix, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
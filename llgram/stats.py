@@ -0,0 +1,85 @@
+import time
+from contextlib import contextmanager
+
+class Stats:
+    def __init__(self):
+        """
+            Collects timings and counters of table generation and parsing.
+
+            Pass an instance to TableGenerator or LLParser to enable the instrumentation, without one nothing is recorded
+            and the uninstrumented code runs. One instance can be shared by several generators and parsers, the values add up.
+
+            timings: dict
+                Seconds spent in every phase (name:seconds), e.g. "lexing", "emptySets", "firstSets", "followSets", "table", "parse"
+
+            counters: dict
+                Counts of events (name:count), e.g. "firstComponents" (strongly connected components solved for the first sets),
+                "lookups" (parsing table lookups), "tokens" (terminals parsed) and "maxStackDepth" (the largest parsing stack seen)
+
+            ruleHits: dict
+                Number of times every rule was applied while parsing (Rule:count)
+        """
+        self.timings = {}
+        self.counters = {}
+        self.ruleHits = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+            Context manager adding the time spent in its block to timings[name].
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, name: str, amount: int=1):
+        """
+            Adds amount to counters[name].
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def maximum(self, name: str, value: int):
+        """
+            Sets counters[name] to value if value is larger.
+        """
+        if value > self.counters.get(name, value - 1):
+            self.counters[name] = value
+
+    def addRuleHits(self, hits: dict):
+        """
+            Adds the counts of a Rule:count dictionary to ruleHits.
+        """
+        ruleHits = self.ruleHits
+        for rule, count in hits.items():
+            ruleHits[rule] = ruleHits.get(rule, 0) + count
+
+    def tokensPerSecond(self) -> float:
+        """
+            Returns the parsing throughput, the number of terminals parsed divided by the time spent parsing
+        """
+        seconds = self.timings.get("parse", 0.0)
+        return self.counters.get("tokens", 0) / seconds if seconds else 0.0
+
+    def clear(self):
+        """
+            Removes all recorded values
+        """
+        self.timings.clear()
+        self.counters.clear()
+        self.ruleHits.clear()
+
+    def asDict(self) -> dict:
+        """
+            Returns the recorded values as a JSON serializable dictionary, rules are converted to strings.
+        """
+        return {
+            "timings":dict(self.timings),
+            "counters":dict(self.counters),
+            "tokensPerSecond":self.tokensPerSecond(),
+            "ruleHits":{str(rule):count for rule, count in self.ruleHits.items()},
+        }
+
+    def __repr__(self):
+        return f"Stats(timings={self.timings!r}, counters={self.counters!r})"
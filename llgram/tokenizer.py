@@ -0,0 +1,170 @@
+import re
+import mmap
+
+from llgram import llexceptions as lle
+from llgram import constants as const
+from llgram.compiled import CompiledTable
+
+ERROR = -1 #terminal of the group matching any character no other pattern matches
+
+class Tokenizer:
+    def __init__(self, table, classes: dict=None, skip: str=r"\s+"):
+        """
+            Splits source text into the terminals of a parsing table using one master regular expression.
+
+            Terminals with a pattern in classes (token classes such as identifiers or numbers) are matched by that pattern,
+            every other terminal of the table is matched literally. The class patterns are tried first, in the order of the dictionary.
+            A class match that equals a literal terminal is reported as that terminal (so keywords win over identifiers),
+            and the literals are tried longest first, so "<=" is preferred to "<".
+
+            Sources can be str, bytes or any bytes-like object, e.g. a memory mapped file (see mapFile).
+            For bytes the patterns and literals are encoded as UTF-8 and matched with bytes semantics.
+
+            Terminals are returned as the IDs of the compiled table, which LLParser.parseIds consumes without any lookup.
+
+            Parameters
+            ----------
+            table: CompiledTable or TableGenerator
+                Table whose terminals are recognized
+
+            classes: dict
+                Regular expressions of token classes (terminal:pattern). The patterns may not match an empty string.
+
+            skip: str
+                Regular expression of the text between terminals, e.g. whitespace and comments. None to skip nothing.
+        """
+        self.compiled = CompiledTable.fromGenerator(table)
+        self.classes = dict(classes or {})
+        self.skip = skip
+
+        for terminal, pattern in self.classes.items():
+            if terminal not in self.compiled.terminalIds or terminal == const.END_SYMBOL:
+                raise ValueError(f"\"{terminal}\" is not a terminal of the table")
+            if re.match(pattern, ""):
+                raise ValueError(f"The pattern of \"{terminal}\" matches an empty string")
+        if skip is not None and re.match(skip, ""):
+            raise ValueError("The skip pattern matches an empty string")
+
+        terminals = (terminal for terminal in self.compiled.terminals if terminal != const.END_SYMBOL and terminal not in self.classes)
+        self.literals = sorted(terminals, key=lambda terminal: (-len(terminal), terminal))
+        self.__patterns = {} #str or bytes:(master pattern, terminal of every group, last group of a class, literal:terminal ID)
+
+    def scan(self, source):
+        """
+            Yields the terminals of the source with their spans.
+
+            Parameters
+            ----------
+            source: str, bytes or bytes-like object
+                Text to tokenize
+
+            Yields
+            ------
+            tuple
+                (terminal ID, start offset, end offset)
+
+            Raises
+            ------
+            ParsingLexicalException
+                If a part of the source matches no terminal, its position is the offset in the source
+        """
+        pattern, groups, classes, keywords = self.__pattern(source)
+        for match in pattern.finditer(source):
+            index = match.lastindex
+            if index is None: #skipped text at the end of the source
+                break
+            terminal = groups[index]
+            if index <= classes:
+                terminal = keywords.get(match.group(index), terminal)
+            elif terminal == ERROR:
+                self.__error(source, match.start(index))
+            yield terminal, match.start(index), match.end(index)
+
+    def ids(self, source):
+        """
+            Yields the terminal IDs of the source, see scan. The result can be passed to LLParser.parseIds.
+        """
+        pattern, groups, classes, keywords = self.__pattern(source)
+        for match in pattern.finditer(source):
+            index = match.lastindex
+            if index is None:
+                break
+            if index <= classes:
+                yield keywords.get(match.group(index), groups[index])
+            else:
+                terminal = groups[index]
+                if terminal == ERROR:
+                    self.__error(source, match.start(index))
+                yield terminal
+
+    def terminals(self, source):
+        """
+            Yields the terminals of the source as symbols, for the parsing methods taking terminals (e.g. LLParser.parse).
+        """
+        symbols = self.compiled.terminals
+        for terminal in self.ids(source):
+            yield symbols[terminal]
+
+    def span(self, source, index: int) -> tuple:
+        """
+            Returns the (start, end) offsets of the terminal at the given position, e.g. the position of a parsing error.
+            The source is scanned again, so this is meant for error reporting only. Positions past the last terminal
+            (the end of input) give an empty span at the end of the source.
+        """
+        for position, (_, start, end) in enumerate(self.scan(source)):
+            if position == index:
+                return start, end
+        return len(source), len(source)
+
+    def __pattern(self, source):
+        kind = str if isinstance(source, str) else bytes
+        pattern = self.__patterns.get(kind)
+        if pattern is None:
+            pattern = self.__patterns[kind] = self.__compile(kind)
+        return pattern
+
+    def __compile(self, kind):
+        #the skipped text is a prefix of every match, so it doesn't need matches of its own
+        encode = (lambda text: text) if kind is str else (lambda text: text.encode("utf-8"))
+        terminalIds = self.compiled.terminalIds
+
+        parts = []
+        groups = [None] #terminal of every group, indexed by the group number
+
+        def add(pattern, terminal):
+            parts.append(f"({pattern})")
+            groups.append(terminal)
+            #groups inside the pattern shift the numbers of the following ones, lastindex is always the outer group
+            groups.extend([None] * re.compile(pattern).groups)
+
+        for terminal, pattern in self.classes.items():
+            add(pattern, terminalIds[terminal])
+        classes = len(groups) - 1 #groups up to this number belong to classes
+        for literal in self.literals:
+            add(re.escape(literal), terminalIds[literal])
+        add(r"[\s\S]", ERROR)
+        parts.append(r"\Z")
+
+        skip = "" if self.skip is None else f"(?:{self.skip})*"
+        keywords = {encode(literal):terminalIds[literal] for literal in self.literals}
+        return re.compile(encode(f"{skip}(?:{'|'.join(parts)})")), groups, classes, keywords
+
+    def __error(self, source, offset):
+        character = source[offset:offset + 1]
+        if not isinstance(character, str):
+            character = bytes(character).decode("utf-8", "replace")
+        raise lle.ParsingLexicalException(f"No terminal matches \"{character}\" at offset {offset}", offset)
+
+def mapFile(path: str):
+    """
+        Memory maps a file for reading, so it can be tokenized without reading it into memory.
+
+        Returns
+        -------
+        mmap or bytes
+            The mapping (an empty bytes object for an empty file, which can't be mapped)
+    """
+    with open(path, "rb") as fin:
+        if fin.seek(0, 2) == 0:
+            return b""
+        return mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
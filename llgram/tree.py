@@ -0,0 +1,134 @@
+from array import array
+
+NO_NODE = -1 #marks a missing child, sibling, rule or token
+
+class ParseTree:
+    def __init__(self, compiled):
+        """
+            Parse tree stored in parallel arrays, one item per node. Node 0 is the root.
+
+            symbol: array
+                Symbol ID of the node (see llgram.compiled.CompiledTable)
+
+            rule: array
+                Rule ID the nonterminal node was rewritten with, NO_NODE for terminals
+
+            firstChild: array
+                Index of the first child, NO_NODE for leaves
+
+            nextSibling: array
+                Index of the next sibling, NO_NODE for the last child
+
+            token: array
+                Position of the matched terminal in the input, NO_NODE for nonterminals
+
+            The children of a node are created together when the node is rewritten, so they occupy consecutive indexes.
+            Node objects are only created on access, see ParseTree.root and ParseTree.node.
+
+            Parameters
+            ----------
+            compiled: CompiledTable
+                Table the tree was parsed with, used to translate IDs to symbols and rules
+        """
+        self.compiled = compiled
+        self.symbol = array('i')
+        self.rule = array('i')
+        self.firstChild = array('i')
+        self.nextSibling = array('i')
+        self.token = array('i')
+
+    def __len__(self):
+        return len(self.symbol)
+
+    @property
+    def root(self):
+        return Node(self, 0)
+
+    def node(self, index: int):
+        return Node(self, index)
+
+    def __iter__(self):
+        """
+            Iterates over all nodes in preorder.
+        """
+        if len(self.symbol):
+            yield from self.root.walk()
+
+class Node:
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: ParseTree, index: int):
+        """
+            Lightweight view of one node of a ParseTree.
+        """
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self):
+        return f"Node({self.symbol!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.tree is other.tree and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    @property
+    def symbolId(self) -> int:
+        return self.tree.symbol[self.index]
+
+    @property
+    def symbol(self) -> str:
+        return self.tree.compiled.symbols[self.tree.symbol[self.index]]
+
+    @property
+    def ruleId(self) -> int:
+        return self.tree.rule[self.index]
+
+    @property
+    def rule(self):
+        """
+            Rule this node was rewritten with, None for terminals
+        """
+        rule = self.tree.rule[self.index]
+        return self.tree.compiled.rules[rule] if rule != NO_NODE else None
+
+    @property
+    def tokenIndex(self) -> int:
+        """
+            Position of the matched terminal in the input, NO_NODE for nonterminals
+        """
+        return self.tree.token[self.index]
+
+    def isTerminal(self) -> bool:
+        return self.tree.symbol[self.index] < self.tree.compiled.terminalCount
+
+    @property
+    def children(self) -> list:
+        return list(self.iterChildren())
+
+    def iterChildren(self):
+        tree = self.tree
+        nextSibling = tree.nextSibling
+        child = tree.firstChild[self.index]
+        while child != NO_NODE:
+            yield Node(tree, child)
+            child = nextSibling[child]
+
+    def walk(self):
+        """
+            Iterates over the subtree of this node in preorder, without recursion.
+        """
+        tree = self.tree
+        firstChild = tree.firstChild
+        nextSibling = tree.nextSibling
+        stack = [self.index]
+        while stack:
+            index = stack.pop()
+            yield Node(tree, index)
+            children = []
+            child = firstChild[index]
+            while child != NO_NODE:
+                children.append(child)
+                child = nextSibling[child]
+            stack.extend(reversed(children))
@@ -0,0 +1,25 @@
+import unittest
+
+from llgram.generation import TableGenerator
+from llgram.parsing import LLParser
+
+class RecoveryTest(unittest.TestCase):
+    def testNullableStartFollowedByItsFollowSet(self):
+        #a terminal following the nullable start symbol after the end of the derivation used to restart the sentence forever
+        parser = LLParser(TableGenerator("S -> ( S ) S\nS -> epsilon"))
+        derivation, errors = parser.parseWithRecovery("( ) ) ( )".split())
+        self.assertEqual([error.position for error in errors], [2])
+        self.assertEqual([str(rule) for rule in derivation].count("S -> ( S ) S"), 2)
+
+        parser = LLParser(TableGenerator("S -> x S y\nS -> epsilon"))
+        derivation, errors = parser.parseWithRecovery(["y"])
+        self.assertEqual([error.position for error in errors], [0])
+        self.assertEqual([str(rule) for rule in derivation], ["S -> epsilon"])
+
+    def testEndSymbolInInput(self):
+        parser = LLParser(TableGenerator("S -> a S\nS -> epsilon"))
+        _, errors = parser.parseWithRecovery(["a", "__$"])
+        self.assertEqual([(type(error).__name__, error.position) for error in errors], [("ParsingLexicalException", 1)])
+
+if __name__ == "__main__":
+    unittest.main()